@@ -1,6 +1,15 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
+import os
+import time
+from collections import deque
+
+from board import count_correct, make_goal, move_table, shuffle_board
+from distance_table import get_distance_table
+from endgame import get_endgame
+from solution_cache import SolutionCache
+from solve_service import SolveService
+from solver import a_star, parallel_ida_star
 
 BG_COLOR       = "#0f172a"
 FRAME_COLOR    = "#111827"
@@ -14,61 +23,41 @@ NEON_GREEN     = "#00ffae"
 BTN_BLUE       = "#2563eb"
 BTN_GREEN      = "#10b981"
 
-# ─────────────────────────────────────────────
-# BOARD UTILITIES
-# ─────────────────────────────────────────────
-
-def create_goal(size):
-    return tuple(list(range(1, size * size)) + [0])
-
-def find_empty(board):
-    return board.index(0)
-
-def get_neighbors(board, size):
-    neighbors = []
-    e = find_empty(board)
-    r, c = divmod(e, size)
+# 5x5 searches are split across this many processes
+CPU_WORKERS    = os.cpu_count() or 1
 
-    for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-        nr, nc = r+dr, c+dc
-        if 0 <= nr < size and 0 <= nc < size:
-            ni = nr * size + nc
-            b = list(board)
-            b[e], b[ni] = b[ni], b[e]
-            neighbors.append(tuple(b))
-    return neighbors
-
-def shuffle_board(goal, size, steps):
-    cur = goal
-    for _ in range(steps):
-        cur = random.choice(get_neighbors(cur, size))
-    return list(cur)
-
-def count_correct(board, goal):
-    return sum(1 for i in range(len(board))
-               if board[i] == goal[i] and board[i] != 0)
-
-# ─────────────────────────────────────────────
-# HEURISTIC (Manhattan Distance)
-# ─────────────────────────────────────────────
+# per-turn CPU latencies kept for the runtime graph
+CPU_TIMES_KEPT = 500
 
-def manhattan(board, goal, size):
-    goal_pos = {v: divmod(i, size) for i, v in enumerate(goal)}
-    dist = 0
-    for i, v in enumerate(board):
-        if v == 0:
-            continue
-        r, c = divmod(i, size)
-        gr, gc = goal_pos[v]
-        dist += abs(r-gr) + abs(c-gc)
-    return dist
 # ─── RUNTIME GRAPH ─────────────────────────────────────────────────────────────
 
-def show_runtime_graph(cpu_times, size):
+def latency_percentiles(times):
+    """(p50, p95, max) of a list of latencies, nearest-rank."""
+    ordered = sorted(times)
+    pick = lambda q: ordered[max(0, -(-q * len(ordered) // 100) - 1)]
+    return pick(50), pick(95), ordered[-1]
+
+def show_runtime_graph(cpu_times, size, metrics=None):
     if not cpu_times:
         return
 
-    fig, ax = plt.subplots(figsize=(9, 4))
+    # matplotlib is only imported once somebody opens the graph
+    try:
+        import matplotlib.pyplot as plt
+        from matplotlib import ticker
+    except ImportError:
+        messagebox.showinfo("Runtime Graph",
+                            "The runtime graph needs matplotlib "
+                            "(pip install matplotlib).")
+        return
+
+    # metrics: SearchMetrics snapshot of the last CPU search, if any
+    if metrics and metrics["nodes"]:
+        fig, (ax, dax) = plt.subplots(1, 2, figsize=(13, 4),
+                                      gridspec_kw={"width_ratios": [3, 2]})
+    else:
+        fig, ax = plt.subplots(figsize=(9, 4))
+        dax = None
     fig.patch.set_facecolor("#0f172a")
     ax.set_facecolor("#111827")
 
@@ -79,7 +68,7 @@ def show_runtime_graph(cpu_times, size):
             markersize=4, markerfacecolor="#00ffae")
     ax.fill_between(turns, cpu_times, alpha=0.15, color="#00f5ff")
 
-    ax.set_title(f"Greedy Solve Time per CPU Turn  ({size}×{size} board)",
+    ax.set_title(f"Time per CPU Turn  ({size}×{size} board)",
                  color="white", fontsize=13, pad=12)
     ax.set_xlabel("CPU Turn", color="#94a3b8", fontsize=11)
     ax.set_ylabel("Time (ms)", color="#94a3b8", fontsize=11)
@@ -91,13 +80,30 @@ def show_runtime_graph(cpu_times, size):
     ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
     ax.grid(color="#1f2937", linestyle="--", linewidth=0.8)
 
-    avg = sum(cpu_times) / len(cpu_times)
-    ax.axhline(avg, color="#f59e0b", linestyle="--",
-               linewidth=1.2, label=f"Avg: {avg:.2f} ms")
+    p50, p95, worst = latency_percentiles(cpu_times)
+    ax.axhline(p50, color="#f59e0b", linestyle="--",
+               linewidth=1.2, label=f"p50: {p50:.2f} ms")
+    ax.axhline(p95, color="#ef4444", linestyle="--",
+               linewidth=1.2, label=f"p95: {p95:.2f} ms")
+    ax.plot([], [], " ", label=f"max: {worst:.2f} ms")
     ax.legend(facecolor="#1f2937", labelcolor="white", fontsize=10)
 
+    if dax is not None:
+        depth = metrics["nodes_by_depth"]
+        dax.set_facecolor("#111827")
+        dax.bar(range(len(depth)), depth, color="#00ffae", alpha=0.8)
+        dax.set_title(f"Last search: {metrics['nodes']:,} nodes, "
+                      f"{metrics['pruned']:,} pruned, "
+                      f"{len(metrics['iterations'])} iterations",
+                      color="white", fontsize=11, pad=12)
+        dax.set_xlabel("Depth", color="#94a3b8", fontsize=11)
+        dax.set_ylabel("Nodes", color="#94a3b8", fontsize=11)
+        dax.tick_params(colors="#94a3b8")
+        for spine in dax.spines.values():
+            spine.set_edgecolor("#1f2937")
+
     plt.tight_layout()
-    plt.show()
+    plt.show(block=False)
 
 
 # ─────────────────────────────────────────────
@@ -112,7 +118,11 @@ class PuzzleGame:
         self.root.geometry("650x720")
 
         self.size = 4
-        self.goal = create_goal(self.size)
+        self.goal = tuple(make_goal(self.size))
+        self.solver = SolveService(self.root)
+        self.cache = SolutionCache()
+        self.cpu_times = deque(maxlen=CPU_TIMES_KEPT)
+        self.turn_started = None
 
         self.build_ui()
         self.start_game()
@@ -140,6 +150,7 @@ class PuzzleGame:
 
         size_menu = tk.OptionMenu(menu_frame,
                                   self.size_var,
+                                  "3x3",
                                   "4x4",
                                   "5x5")
         size_menu.config(bg="#1e293b", fg="white",
@@ -161,6 +172,18 @@ class PuzzleGame:
                                   bg=BG_COLOR)
         self.score_lbl.pack(pady=8)
 
+        self.status_lbl = tk.Label(self.root,
+                                   font=("Arial", 10),
+                                   fg="#94a3b8",
+                                   bg=BG_COLOR)
+        self.status_lbl.pack()
+
+        self.latency_lbl = tk.Label(self.root,
+                                    font=("Arial", 10),
+                                    fg="#94a3b8",
+                                    bg=BG_COLOR)
+        self.latency_lbl.pack()
+
         self.board_outer = tk.Frame(self.root,
                                     bg=NEON_BLUE,
                                     padx=4, pady=4)
@@ -190,6 +213,20 @@ class PuzzleGame:
                   relief="flat",
                   command=self.start_game).grid(row=0, column=1, padx=10)
 
+        tk.Button(btn_frame,
+                  text="✖ Cancel",
+                  bg="#475569",
+                  fg="white",
+                  relief="flat",
+                  command=self.cancel_cpu).grid(row=0, column=2, padx=10)
+
+        tk.Button(btn_frame,
+                  text="📈 Runtime",
+                  bg="#475569",
+                  fg="white",
+                  relief="flat",
+                  command=self.open_runtime_graph).grid(row=0, column=3, padx=10)
+
         self.animate_neon()
 
     def animate_neon(self):
@@ -200,8 +237,14 @@ class PuzzleGame:
     # ───────── GAME SETUP ─────────
 
     def change_size(self):
-        self.size = 5 if self.size_var.get() == "5x5" else 4
-        self.goal = create_goal(self.size)
+        self.size = int(self.size_var.get()[0])
+        self.goal = tuple(make_goal(self.size))
+        if self.size == 3:
+            # built once (about a second), then every CPU move is a lookup
+            self.status_lbl.config(text="Loading 3x3 distance table…")
+            self.root.update_idletasks()
+            get_distance_table(self.goal, self.size, build=True)
+        self.cpu_times.clear()      # the graph is per board size
         self.start_game()
 
     def build_board_buttons(self):
@@ -227,11 +270,11 @@ class PuzzleGame:
 
     def start_game(self):
 
-        self.shuffle_steps = 35 if self.size == 4 else 45
+        self.solver.cancel()
+        self.shuffle_steps = {3: 25, 4: 35, 5: 45}[self.size]
 
-        self.board = shuffle_board(self.goal,
-                                   self.size,
-                                   self.shuffle_steps)
+        self.board = shuffle_board(self.size, self.shuffle_steps)
+        self.empty = self.board.index(0)
 
         self.human_score = 0
         self.cpu_score = 0
@@ -241,9 +284,13 @@ class PuzzleGame:
 
         self.turn = "HUMAN"
         self.auto_mode = False
+        self.plan = deque()
+        self.search_metrics = None
+        self.turn_started = None
 
         self.build_board_buttons()
         self.update_ui()
+        self.status_lbl.config(text="")
 
     # ───────── UI UPDATE ─────────
 
@@ -278,12 +325,13 @@ class PuzzleGame:
         if self.turn != "HUMAN":
             return
 
-        for nb in get_neighbors(tuple(self.board), self.size):
-            if nb[idx] == 0:
-                self.board = list(nb)
-                self.human_moves += 1
-                self.update_score("HUMAN")
-                break
+        if idx in move_table(self.size)[self.empty]:
+            e = self.empty
+            self.board[e], self.board[idx] = self.board[idx], 0
+            self.empty = idx
+            self.follow_plan(idx)
+            self.human_moves += 1
+            self.update_score("HUMAN")
 
         self.update_ui()
 
@@ -294,16 +342,62 @@ class PuzzleGame:
         self.turn = "CPU"
         self.root.after(500, self.cpu_turn)
 
+    def follow_plan(self, idx):
+        # The cached plan stays optimal only while moves follow it
+        if self.plan and self.plan[0] == idx:
+            self.plan.popleft()
+        else:
+            self.plan.clear()
+
     def cpu_turn(self):
 
-        solution = ida_star(self.board,
-                            self.goal,
-                            self.size)
+        if self.turn != "CPU" or self.solver.busy:
+            return
 
-        if not solution or len(solution) < 2:
+        # A turn runs from here to the move, including any background search
+        if self.turn_started is None:
+            self.turn_started = time.perf_counter_ns()
+
+        exact = get_distance_table(self.goal, self.size, build=True)
+        if not self.plan and exact is not None:
+            # Every board of this size is in the table: one optimal move
+            # per lookup, no search and no plan to keep in sync
+            self.plan = deque([exact.lookup(self.board)[1]])
+
+        if not self.plan:
+            # Positions solved before (this session or earlier), or close
+            # enough to the goal for the endgame table, need no search
+            known = self.cache.solution(self.board, self.size)
+            if not known:
+                table = get_endgame(self.goal, self.size)
+                known = table.solution(self.board) if table else None
+            if known:
+                self.plan = deque(known)
+
+        if not self.plan:
+            # Search off the Tk thread; plan_ready resumes the turn
+            self.status_lbl.config(text="CPU thinking…")
+            # A* expands far fewer nodes on the boards a game deals and
+            # hands over to IDA* itself if its open list grows too big
+            if self.size == 5 and CPU_WORKERS > 1:
+                solve = parallel_ida_star
+            else:
+                solve = a_star
+            self.solver.start(solve,
+                              list(self.board),
+                              self.goal,
+                              self.size,
+                              on_done=self.plan_ready,
+                              on_progress=self.show_progress,
+                              on_metrics=self.record_metrics,
+                              on_error=self.cpu_failed)
             return
 
-        self.board = list(solution[1])
+        idx = self.plan.popleft()
+        e = self.empty
+        self.board[e], self.board[idx] = self.board[idx], 0
+        self.empty = idx
+        self.record_turn_time()
         self.cpu_moves += 1
         self.update_score("CPU")
         self.update_ui()
@@ -317,7 +411,58 @@ class PuzzleGame:
         else:
             self.root.after(250, self.cpu_turn)
 
+    def plan_ready(self, solution):
+        self.status_lbl.config(text="")
+        if not solution:
+            return
+        # the board has not moved since the search started
+        self.cache.put_path(self.board, self.size, solution)
+        self.plan = deque(solution)
+        self.cpu_turn()
+
+    def show_progress(self, nodes, bound, elapsed):
+        self.status_lbl.config(
+            text=f"CPU thinking…  {nodes:,} nodes  ·  "
+                 f"bound {bound}  ·  {elapsed:.1f}s")
+
+    def record_turn_time(self):
+        ms = (time.perf_counter_ns() - self.turn_started) / 1e6
+        self.turn_started = None
+        self.cpu_times.append(ms)
+        p50, p95, worst = latency_percentiles(self.cpu_times)
+        self.latency_lbl.config(
+            text=f"CPU turn  p50 {p50:.1f} ms  ·  p95 {p95:.1f} ms  ·  "
+                 f"max {worst:.1f} ms  ({len(self.cpu_times)} turns)")
+
+    def open_runtime_graph(self):
+        if not self.cpu_times:
+            self.status_lbl.config(text="No CPU turns timed yet.")
+            return
+        show_runtime_graph(list(self.cpu_times), self.size,
+                           self.search_metrics)
+
+    def record_metrics(self, snapshot):
+        # Latest SearchMetrics snapshot, shown by show_runtime_graph
+        self.search_metrics = snapshot
+
+    def cpu_failed(self, exc):
+        self.turn_started = None
+        self.auto_mode = False
+        self.turn = "HUMAN"
+        self.status_lbl.config(text=f"CPU search failed ({exc}) — your turn.")
+
+    def cancel_cpu(self):
+        if not self.solver.busy:
+            return
+        self.solver.cancel()
+        self.turn_started = None
+        self.auto_mode = False
+        self.turn = "HUMAN"
+        self.status_lbl.config(text="CPU search cancelled — your turn.")
+
     def cpu_auto_solve(self):
+        if self.turn is None:
+            return
         self.auto_mode = True
         self.turn = "CPU"
         self.cpu_turn()
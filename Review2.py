@@ -1,10 +1,13 @@
-import random
-import sys
 import tkinter as tk
 from tkinter import font as tkfont
 import time
 
-sys.setrecursionlimit(999999)
+from backtrack import PureBacktrackSolver, TraceStore
+from board import apply_move, get_moves, make_goal, shuffle_board
+from distance_table import get_distance_table
+from metrics import SearchMetrics
+from solution_cache import SolutionCache
+from solver import ida_star
 
 #  COLOURS 
 BG_MAIN      = "#F5F7FA"       
@@ -36,89 +39,13 @@ BTN_RESET    = "#C0392B"
 BTN_BLUE     = "#2980B9"      
 BTN_PURPLE   = "#7D3C98"       
 BTN_GREY     = "#7F8C8D"     
-#  BOARD HELPERS
-def make_goal(size):
-    return list(range(1, size * size)) + [0]
-
-def get_moves(board, size):
-    e = board.index(0)
-    r, c = divmod(e, size)
-    out = []
-    for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-        nr, nc = r+dr, c+dc
-        if 0 <= nr < size and 0 <= nc < size:
-            out.append(nr*size + nc)
-    return out
-
-def apply_move(board, idx):
-    b = list(board); e = b.index(0)
-    b[e], b[idx] = b[idx], b[e]
-    return tuple(b)
-
-def shuffle_board(size, steps=12):
-    b = make_goal(size)
-    for _ in range(steps):
-        b = list(apply_move(tuple(b), random.choice(get_moves(b, size))))
-    return b
-
-class PureBacktrackSolver:
-    DEPTH_LIMIT = 15
-    def __init__(self, start, size, goal):
-        self.start      = tuple(start)
-        self.size       = size
-        self.goal_t     = tuple(goal)
-        self.trace      = []
-        self.found      = False
-
-    def solve(self):
-        path_set = {self.start}
-        self._dfs(self.start, path_set, 0)
-        return self.trace
-
-    def _dfs(self, board, path_set, depth):
-        if self.found:
-            return
-
-        # ── GOAL CHECK ───────────────────────────────────────────────────────
-        if board == self.goal_t:
-            self.trace.append(("done", board, None))
-            self.found = True
-            return
-
-        # ── DEPTH LIMIT ──────────────────────────────────────────────────────
-        if depth >= self.DEPTH_LIMIT:
-            return
-
-        # ── TRY EVERY NEIGHBOUR ──────────────────────────────────────────────
-        for idx in get_moves(list(board), self.size):
-            if self.found:
-                return
-
-            next_board = apply_move(board, idx)
-
-            # Skip only if this state is already on the CURRENT PATH
-            if next_board in path_set:
-                continue
-
-            moved = tile_that_moved(board, next_board)
-
-            # ── GOING DEEPER (PURPLE) ─────────────────────────────────────────
-            self.trace.append(("try", next_board, moved))
-
-            path_set.add(next_board)
-            self._dfs(next_board, path_set, depth + 1)
-            path_set.discard(next_board)
-
-            if self.found:
-                return
-            self.trace.append(("back", board, moved))
-
 class RuntimeGraph:
     """
     A separate Toplevel window that shows a live line graph of:
       - Steps Tried (purple line)
       - Backtracks   (red line)
     plotted against step number (x-axis) as the solver replays.
+    A footer shows the solver's SearchMetrics live once watch() is called.
     """
     SAMPLE_EVERY = 10   # record a data point every N steps for performance
 
@@ -148,6 +75,12 @@ class RuntimeGraph:
                                 highlightthickness=0)
         self.canvas.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
+        # Search metrics footer
+        self.metrics_lbl = tk.Label(self.win, text="", font=sf, bg=BG_PANEL,
+                                    fg=TEXT_MID, justify="left", anchor="w")
+        self.metrics_lbl.pack(fill="x", padx=10, pady=(0, 8))
+        self._metrics = None
+
         # Data
         self.tries_data  = []   # cumulative tries per sample point
         self.backs_data  = []   # cumulative backtracks per sample point
@@ -164,6 +97,24 @@ class RuntimeGraph:
         self._tries_cum  = 0
         self._backs_cum  = 0
         self.canvas.delete("all")
+        self.metrics_lbl.config(text="")
+
+    def watch(self, metrics):
+        """Subscribe to a SearchMetrics; drops the previous subscription."""
+        if self._metrics is not None:
+            self._metrics.unsubscribe(self._on_metrics)
+        self._metrics = metrics
+        metrics.subscribe(self._on_metrics)
+
+    def _on_metrics(self, m):
+        if not self.win.winfo_exists():
+            m.unsubscribe(self._on_metrics)
+            return
+        depth = "  ".join(f"{d}:{n}" for d, n in
+                          enumerate(m.nodes_by_depth) if n)
+        self.metrics_lbl.config(
+            text=f"Tries by depth  {depth}\n"
+                 f"Pruned: {m.pruned:,}   TT hits: {m.tt_hits:,}")
 
     def record(self, action):
         """Call this on every step during playback."""
@@ -273,7 +224,7 @@ class Launcher:
     def __init__(self, root):
         self.root = root
         root.title("Sliding Puzzle — Backtracking Visualizer")
-        root.geometry("620x440")
+        root.geometry("860x440")
         root.configure(bg=BG_MAIN)
         root.resizable(True, True)
         self._build()
@@ -309,12 +260,14 @@ class Launcher:
         # Puzzle selection cards
         cards = tk.Frame(self.root, bg=BG_MAIN, pady=10)
         cards.pack(fill="x", padx=50)
-        cards.columnconfigure(0, weight=1)
-        cards.columnconfigure(1, weight=1)
+        for col in range(3):
+            cards.columnconfigure(col, weight=1)
+        self._card(cards, "8 PUZZLE", "3 × 3 grid  ·  Numbers 1–8  ·  Warm-up",
+                   "#1E8449", BTN_START, lambda: self._go(3), 0)
         self._card(cards, "15 PUZZLE", "4 × 4 grid  ·  Numbers 1–15",
-                   "#1A5276", BTN_BLUE,  lambda: self._go(4), 0)
+                   "#1A5276", BTN_BLUE,  lambda: self._go(4), 1)
         self._card(cards, "25 PUZZLE", "5 × 5 grid  ·  Numbers 1–24  ·  Harder!",
-                   "#7D3C98", BTN_PURPLE, lambda: self._go(5), 1)
+                   "#7D3C98", BTN_PURPLE, lambda: self._go(5), 2)
 
     def _card(self, parent, title, sub, title_color, btn_color, cmd, col):
         card = tk.Frame(parent, bg=BG_PANEL, padx=24, pady=20,
@@ -332,6 +285,9 @@ class Launcher:
                   activebackground=btn_color, command=cmd).pack(pady=(12,0))
 
     def _go(self, size):
+        if size == 3:
+            # exact distances make every 3x3 solution lookup optimal
+            get_distance_table(tuple(make_goal(size)), size, build=True)
         self.root.destroy()
         r = tk.Tk()
         PuzzleGame(r, size)
@@ -346,29 +302,27 @@ class PuzzleGame:
         self.root  = root
         self.SIZE  = size
         self.GOAL  = make_goal(size)
-        lbl        = "15" if size == 4 else "25"
+        lbl        = str(size * size - 1)
         root.title(f"{lbl} Puzzle — Backtracking Visualizer")
         root.configure(bg=BG_MAIN)
         root.resizable(True, True)
 
-        w = 920 if size == 4 else 960
-        h = 660 if size == 4 else 680
+        w = 960 if size == 5 else 920
+        h = 680 if size == 5 else 660
         root.geometry(f"{w}x{h}")
 
         self.board        = self.GOAL.copy()
+        self.blank        = size * size - 1
         self.is_started   = False
         self.game_over    = False
         self.auto_playing = False
         self.auto_paused  = False
-        self.trace        = []
-        self.trace_idx    = 0
         self.speed_ms     = 200
         self.last_solver  = None
+        self.cache        = SolutionCache()
         self.start_time   = None
         self.elapsed      = 0
-        self._total_tries = 0
-        self._total_backs = 0
-        self._total_steps = 0
+        self._clear_trace()
 
         # Runtime graph window (created once, reused)
         self._graph: RuntimeGraph | None = None
@@ -386,10 +340,41 @@ class PuzzleGame:
             self._graph.reset()
             self._graph.win.lift()
 
+    # ── streamed trace ───────────────────────────────────────────────────────
+    def _clear_trace(self):
+        self.trace        = TraceStore(self.board)
+        self.trace_idx    = 0       # step number of the next frame to show
+        self._events      = None
+        self._total_tries = 0
+        self._total_backs = 0
+        self._total_steps = 0
+
+    def _pull(self):
+        """Fetch the next solver event into the history; False once exhausted."""
+        if self._events is None:
+            return False
+        event = next(self._events, None)
+        if event is None:
+            self._events = None
+            return False
+        self.trace.append(event)
+        self._total_steps += 1
+        if event[0] == "try":
+            self._total_tries += 1
+        elif event[0] == "back":
+            self._total_backs += 1
+        return True
+
+    def _has_next(self):
+        return self.trace_idx < len(self.trace) or self._pull()
+
+    def _trace_len(self):
+        return f"{self._total_steps}" if self._events is None else "…"
+
     def _fonts(self):
         self.F_HDR    = tkfont.Font(family="Georgia", size=15, weight="bold")
         self.F_SUB    = tkfont.Font(family="Verdana", size=8)
-        sz            = 24 if self.SIZE == 4 else 18
+        sz            = 18 if self.SIZE == 5 else 24
         self.F_TILE   = tkfont.Font(family="Georgia", size=sz, weight="bold")
         self.F_BTN    = tkfont.Font(family="Verdana", size=9,  weight="bold")
         self.F_STAT_V = tkfont.Font(family="Verdana", size=16, weight="bold")
@@ -399,7 +384,7 @@ class PuzzleGame:
         self.F_ACT    = tkfont.Font(family="Verdana", size=11, weight="bold")
 
     def _build(self):
-        lbl = "15 PUZZLE" if self.SIZE == 4 else "25 PUZZLE"
+        lbl = f"{self.SIZE * self.SIZE - 1} PUZZLE"
 
         top = tk.Frame(self.root, bg=HDR_BG, pady=10)
         top.pack(fill="x")
@@ -429,7 +414,7 @@ class PuzzleGame:
         self.grid_frame = tk.Frame(outer, bg=HDR_BG)
         self.grid_frame.pack()
 
-        tw = 5 if self.SIZE == 4 else 4
+        tw = 4 if self.SIZE == 5 else 5
         th = 2
 
         self.buttons = []
@@ -608,11 +593,12 @@ class PuzzleGame:
 
     def _start_game(self):
         self.board        = shuffle_board(self.SIZE, 12)
+        self.blank        = self.board.index(0)
         self.is_started   = True
         self.start_time   = time.time()
         self.game_over    = False
         self.auto_playing = False
-        self.trace = []; self.trace_idx = 0
+        self._clear_trace()
         self.last_solver  = None
         self.lbl_tries.config(text="—")
         self.lbl_backs.config(text="—")
@@ -627,12 +613,13 @@ class PuzzleGame:
 
     def _reset(self):
         self.board        = shuffle_board(self.SIZE, 12)
+        self.blank        = self.board.index(0)
         self.is_started   = True
         self.start_time   = time.time()
         self.game_over    = False
         self.auto_playing = False
         self.auto_paused  = False
-        self.trace = []; self.trace_idx = 0
+        self._clear_trace()
         self.last_solver  = None
         self.lbl_tries.config(text="—")
         self.lbl_backs.config(text="—")
@@ -645,9 +632,10 @@ class PuzzleGame:
     def _click(self, idx):
         if self.auto_playing or not self.is_started or self.game_over:
             return
-        if idx not in get_moves(self.board, self.SIZE):
+        if idx not in get_moves(self.board, self.SIZE, self.blank):
             return
-        self.board = list(apply_move(tuple(self.board), idx))
+        self.board = list(apply_move(self.board, idx, self.blank))
+        self.blank = idx
         if self.board == self.GOAL:
             self._draw()
             self._popup_solved(manual=True)
@@ -662,31 +650,46 @@ class PuzzleGame:
             return
         if not self.is_started:
             self.board      = shuffle_board(self.SIZE, 12)
+            self.blank      = self.board.index(0)
             self.is_started = True
             self.start_time = time.time()
             self.game_over  = False
 
+        # A position solved before is replayed straight from the cache
+        cached = self.cache.solution(self.board, self.SIZE)
+        if cached:
+            self.last_solver  = cached
+            self._clear_trace()
+            self._events      = self._replay(cached)
+            self.status.config(
+                text=f"▶  Known position — replaying {len(cached)} "
+                     f"optimal moves…", fg="#FFFFFF")
+            self.auto_playing = True
+            self.auto_paused  = False
+            self.game_over    = False
+            self.btn_pp.config(text="⏸ Pause")
+            self._ensure_graph()
+            self._play()
+            return
+
         self.status.config(
             text="⏳  Running pure backtracking solver…", fg="#FFFFFF")
         self.action_lbl.config(text="Computing…", fg=BTN_BLUE)
         self.lbl_tries.config(text="—")
         self.lbl_backs.config(text="—")
-        self.root.update()
 
-        solver = PureBacktrackSolver(self.board, self.SIZE, self.GOAL)
-        solver.solve()
+        # events are produced lazily as _play consumes them
+        metrics = SearchMetrics(every=RuntimeGraph.SAMPLE_EVERY)
+        solver = PureBacktrackSolver(self.board, self.SIZE, self.GOAL,
+                                     metrics=metrics)
         self.last_solver  = solver
-        self.trace        = solver.trace
-        self.trace_idx    = 0
+        self._clear_trace()
+        self._events      = solver.events()
 
-        if not self.trace:
+        if not self._has_next():
             self.status.config(text="No solution found.", fg=BACK_BG)
             return
 
-        self._total_tries = sum(1 for a,_,__ in self.trace if a == "try")
-        self._total_backs = sum(1 for a,_,__ in self.trace if a == "back")
-        self._total_steps = len(self.trace)
-
         self.status.config(text="▶  Backtracking in progress…", fg="#FFFFFF")
         self.auto_playing = True
         self.auto_paused  = False
@@ -695,13 +698,14 @@ class PuzzleGame:
 
         # ── open & reset the runtime graph automatically ──────────────────────
         self._ensure_graph()
+        self._graph.watch(metrics)
 
         self._play()
 
     def _play(self):
         if not self.auto_playing or self.auto_paused:
             return
-        if self.trace_idx >= len(self.trace):
+        if not self._has_next():
             self.auto_playing = False
             self.lbl_tries.config(text=f"{self._total_steps:,}")
             self.lbl_backs.config(text=f"{self._total_backs:,}")
@@ -709,6 +713,7 @@ class PuzzleGame:
             if self._graph and self._graph.win.winfo_exists():
                 self._graph.finalise()
             if self.board == self.GOAL:
+                self._remember_solution()
                 self.status.config(
                     text=f"✅  SOLVED!   Steps: {self._total_steps:,}  "
                          f"|  Backtracks: {self._total_backs:,}",
@@ -721,15 +726,33 @@ class PuzzleGame:
         self._step_fwd()
         self.root.after(self.speed_ms, self._play)
 
+    def _replay(self, moves):
+        """Trace events for a known solution: one try per move, then done."""
+        b = list(self.board)
+        for idx in moves:
+            e = b.index(0)
+            b[e], b[idx] = b[idx], 0
+            yield ("try", tuple(b), e)
+        yield ("done", tuple(b), None)
+
+    def _remember_solution(self):
+        # The backtracker's path is not always the shortest, and the cache
+        # holds optimal moves only; IDA* is instant at this depth.
+        start = list(self.trace.start)
+        if self.cache.get(start, self.SIZE) is None:
+            self.cache.put_path(start, self.SIZE,
+                                ida_star(start, self.GOAL, self.SIZE))
+
     def _step_fwd(self):
-        if self.trace_idx >= len(self.trace):
+        if not self._has_next():
             return
         action, board_t, hi = self.trace[self.trace_idx]
         self.board      = list(board_t)
+        self.blank      = board_t.index(0)
         self.trace_idx += 1
 
         self._draw(hi=hi, action=action)
-        self.step_bar.config(text=f"Step {self.trace_idx} / {len(self.trace)}")
+        self.step_bar.config(text=f"Step {self.trace_idx} / {self._trace_len()}")
 
         # ── feed the graph ────────────────────────────────────────────────────
         if self._graph and self._graph.win.winfo_exists():
@@ -745,7 +768,7 @@ class PuzzleGame:
                 fg=TRY_BG)
             self.status.config(
                 text=f"🟣  Trying →  Tile [{tile_val}]  moved forward   "
-                     f"│  Step {self.trace_idx}/{len(self.trace)}",
+                     f"│  Step {self.trace_idx}/{self._trace_len()}",
                 fg="#FFFFFF")
 
         elif action == "back":
@@ -754,7 +777,7 @@ class PuzzleGame:
                 fg=BACK_BG)
             self.status.config(
                 text=f"🔴  BACKTRACKING!  Tile [{tile_val}]  at ({r},{c}) — dead end, undoing!   "
-                     f"│  Step {self.trace_idx}/{len(self.trace)}",
+                     f"│  Step {self.trace_idx}/{self._trace_len()}",
                 fg=BACK_BG)
 
         elif action == "done":
@@ -769,9 +792,10 @@ class PuzzleGame:
         self.trace_idx -= 2
         action, board_t, hi = self.trace[self.trace_idx]
         self.board = list(board_t)
+        self.blank = board_t.index(0)
         self.trace_idx += 1
         self._draw(hi=hi, action=action)
-        self.step_bar.config(text=f"Step {self.trace_idx} / {len(self.trace)}")
+        self.step_bar.config(text=f"Step {self.trace_idx} / {self._trace_len()}")
 
     def _auto_pause(self):
         if not self.auto_playing:
@@ -0,0 +1,216 @@
+"""
+Depth-limited backtracking search used by the Review 2 visualizer,
+plus the compact trace it records.  Headless: no tkinter import.
+"""
+from array import array
+
+from board import cell_bits, pack
+from pruning import directions, pruning_automaton
+
+
+class TraceStore:
+    """
+    Compact solver trace.  Consecutive boards differ by one blank swap,
+    so each event is stored as three bytes — action code, highlighted
+    cell, blank cell afterwards — plus a full keyframe every
+    KEYFRAME_EVERY events.  Indexing rebuilds (action, board, moved_idx)
+    on demand; stepping to a neighbouring index is one swap, and any
+    other index is at most KEYFRAME_EVERY swaps from a keyframe.
+    """
+    ACTIONS        = ("try", "back", "done")
+    CODES          = {a: i for i, a in enumerate(ACTIONS)}
+    NO_CELL        = 255
+    KEYFRAME_EVERY = 64
+
+    def __init__(self, start):
+        self.start     = bytes(start)
+        self.actions   = array("B")
+        self.moved     = array("B")
+        self.blanks    = array("B")
+        self.keyframes = []             # board before event k * KEYFRAME_EVERY
+        self._tail     = bytearray(start)
+        self._tail_blank = self._tail.index(0)
+        # last rebuilt board, so sequential access costs one swap
+        self._cur_i     = -1
+        self._cur_board = bytearray(start)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, event):
+        action, board, hi = event
+        i = len(self.actions)
+        if i % self.KEYFRAME_EVERY == 0:
+            self.keyframes.append(bytes(self._tail))
+        blank = board.index(0)
+        self._swap(self._tail, self._tail_blank, blank)
+        self._tail_blank = blank
+        self.actions.append(self.CODES[action])
+        self.moved.append(self.NO_CELL if hi is None else hi)
+        self.blanks.append(blank)
+
+    def extend(self, events):
+        for event in events:
+            self.append(event)
+
+    @staticmethod
+    def _swap(b, frm, to):
+        # blank moves frm -> to: the tile at `to` slides into `frm`
+        if frm != to:
+            b[frm] = b[to]
+            b[to]  = 0
+
+    def _blank_before(self, i):
+        return self.blanks[i - 1] if i else self.start.index(0)
+
+    def _seek(self, i):
+        cur, b = self._cur_i, self._cur_board
+        if not (0 <= i - cur <= self.KEYFRAME_EVERY
+                or 0 < cur - i <= self.KEYFRAME_EVERY):
+            k   = i // self.KEYFRAME_EVERY
+            b   = bytearray(self.keyframes[k])
+            cur = k * self.KEYFRAME_EVERY - 1
+        while cur < i:
+            cur += 1
+            self._swap(b, self._blank_before(cur), self.blanks[cur])
+        while cur > i:
+            self._swap(b, self.blanks[cur], self._blank_before(cur))
+            cur -= 1
+        self._cur_i, self._cur_board = cur, b
+        return b
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("trace index out of range")
+        board = tuple(self._seek(i))
+        hi = self.moved[i]
+        return (self.ACTIONS[self.actions[i]], board,
+                None if hi == self.NO_CELL else hi)
+
+
+class PureBacktrackSolver:
+    """
+    Depth-limited DFS that records every try / back / done event.
+
+    Runs on an explicit stack over one mutable board: a try swaps the
+    blank in place, a back swaps it back.  States on the current path are
+    kept as packed ints, so the only tuples built are the trace frames.
+    Moves that would undo the last one, or retrace a route the pruning
+    automaton already covers, are never tried.
+
+    With a transposition.TranspositionTable, a state already expanded at
+    the same depth or shallower is skipped like a state on the path.
+    A metrics.SearchMetrics, if given, counts tries per depth, pruned
+    children and table hits, and treats the whole run as one iteration.
+    """
+    DEPTH_LIMIT = 15
+    def __init__(self, start, size, goal, table=None, metrics=None):
+        self.start      = tuple(start)
+        self.size       = size
+        self.goal_t     = tuple(goal)
+        self.trace      = TraceStore(self.start)
+        self.found      = False
+        self.bits       = cell_bits(size)
+        self.table      = table
+        self.metrics    = metrics
+
+    def solve(self):
+        self.trace.extend(self.events())
+        return self.trace
+
+    def events(self):
+        """Yield (action, board, moved_idx) events lazily as the DFS runs."""
+        b      = list(self.start)
+        bits   = self.bits
+        moves  = directions(self.size)
+        fsm, start = pruning_automaton()
+        limit  = self.DEPTH_LIMIT
+        table  = self.table
+        metrics = self.metrics
+        by_depth = None if metrics is None else metrics.nodes_by_depth
+        tries  = 0
+        goal   = pack(self.goal_t, self.size)
+        state  = pack(b, self.size)
+
+        # ── GOAL CHECK ON THE START ──────────────────────────────────────────
+        if state == goal:
+            self.found = True
+            yield ("done", self.start, None)
+            return
+        if limit <= 0:
+            return
+        if metrics is not None:
+            metrics.begin_iteration(limit)
+
+        path_set = {state}
+        # frame = [blank, packed state, automaton state, next move to try]
+        stack = [[b.index(0), state, start, 0]]
+        while stack:
+            frame = stack[-1]
+            blank, state, fsm_state, k = frame
+            opts = moves[blank]
+
+            # ── ALL NEIGHBOURS DONE: BACKTRACK (RED) ─────────────────────────
+            if k == len(opts):
+                stack.pop()
+                path_set.discard(state)
+                if not stack:
+                    if metrics is not None:
+                        metrics.end_iteration(limit)
+                    break
+                parent = stack[-1][0]
+                b[blank], b[parent] = b[parent], 0
+                yield ("back", tuple(b), parent)
+                continue
+
+            d, idx = opts[k]
+            frame[3] = k + 1
+            next_fsm = fsm[(fsm_state << 2) + d]
+            if next_fsm < 0:
+                if by_depth is not None:
+                    metrics.pruned += 1
+                continue
+            tile = b[idx]
+            next_state = state + (tile << blank * bits) - (tile << idx * bits)
+
+            # Skip only if this state is already on the CURRENT PATH
+            if next_state in path_set:
+                if by_depth is not None:
+                    metrics.pruned += 1
+                continue
+            # ...or if it was already explored with at least as many moves left
+            if table is not None and table.probe(next_state, len(stack)):
+                if by_depth is not None:
+                    metrics.tt_hits += 1
+                continue
+
+            # ── GOING DEEPER (PURPLE) ─────────────────────────────────────────
+            b[blank], b[idx] = tile, 0
+            if by_depth is not None:
+                by_depth[len(stack)] += 1
+                tries += 1
+                if not tries % metrics.every:
+                    metrics.publish()
+            yield ("try", tuple(b), blank)
+
+            if next_state == goal:
+                self.found = True
+                if metrics is not None:
+                    metrics.end_iteration(limit)
+                yield ("done", tuple(b), None)
+                return
+
+            # ── DEPTH LIMIT: undo straight away ──────────────────────────────
+            if len(stack) >= limit:
+                b[blank], b[idx] = 0, tile
+                yield ("back", tuple(b), blank)
+                continue
+
+            path_set.add(next_state)
+            stack.append([idx, next_state, next_fsm, 0])
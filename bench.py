@@ -0,0 +1,419 @@
+"""
+Reproducible benchmarks for the headless solvers.
+
+    python bench.py
+    python bench.py --suites walk-4x4,band-4x4 --engines ida,bidir \
+                    --heuristics manhattan,linear_conflict,pdb --out new.json
+    python bench.py --compare base.json new.json
+
+Every suite is a fixed, seeded instance set, so runs on different
+commits solve exactly the same boards:
+
+    easy-3x3     uniformly random 3x3 boards
+    walk-4x4     60-move random walks on 4x4
+    band-4x4     uniformly random 4x4 boards with Manhattan distance 30-36
+    korf100      Korf's 100 random 4x4 instances (the first 10 unless
+                 --count says otherwise; they take minutes each)
+    sample-5x5   80-move random walks on 5x5
+
+Each engine/heuristic pair runs in a fresh child process, so the peak RSS
+reported is that pair's own (tables included).  Per-instance records and
+per-pair summaries (solved, timeouts, nodes, nodes/sec, mean length, peak
+RSS, table files read) are written as one JSON document.  3x3 records
+are checked against the exact distance table when it has been built, and
+any solution longer than optimal is counted under "suboptimal".
+
+Endgame tables are left out unless --endgame is given, and the meta lists
+every table file the run read; --compare warns when two runs differ
+there, since their node counts are then not comparable.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from board import make_goal, random_instances, shuffle_board
+from cli import solve_one
+from endgame import get_endgame
+from heuristics import get_heuristic
+from solver import SearchCancelled
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SUITES = {
+    "easy-3x3":   dict(size=3, count=30, kind="uniform", seed=1),
+    "walk-4x4":   dict(size=4, count=30, kind="walk", steps=60, seed=2),
+    "band-4x4":   dict(size=4, count=10, kind="band", band=(30, 36), seed=3),
+    "korf100":    dict(size=4, count=10, kind="korf"),
+    "sample-5x5": dict(size=5, count=5, kind="walk", steps=80, seed=5),
+}
+
+# engines that ignore --heuristics run once, under this name
+NO_HEURISTIC = "-"
+USES_HEURISTIC = ("ida", "ida-parallel", "astar")
+
+
+# ─────────────────────────────────────────────
+# INSTANCE SETS
+# ─────────────────────────────────────────────
+
+def from_blank_first(cells):
+    """
+    Map a board whose goal is 0, 1, .., N-1 onto the standard goal
+    (1..N-1, blank last) by turning it half a turn and renumbering the
+    tiles.  Moves are symmetric, so solution lengths are unchanged.
+    """
+    n = len(cells)
+    return [0 if v == 0 else n - v for v in reversed(cells)]
+
+
+# Korf (1985), "Depth-first iterative-deepening", table 1: 100 random
+# 4x4 boards, one per line, with the blank-first goal 0, 1, .., 15
+KORF100 = """\
+14 13 15 7 11 12 9 5 6 0 2 1 4 8 10 3
+13 5 4 10 9 12 8 14 2 3 7 1 0 15 11 6
+14 7 8 2 13 11 10 4 9 12 5 0 3 6 1 15
+5 12 10 7 15 11 14 0 8 2 1 13 3 4 9 6
+4 7 14 13 10 3 9 12 11 5 6 15 1 2 8 0
+14 7 1 9 12 3 6 15 8 11 2 5 10 0 4 13
+2 11 15 5 13 4 6 7 12 8 10 1 9 3 14 0
+12 11 15 3 8 0 4 2 6 13 9 5 14 1 10 7
+3 14 9 11 5 4 8 2 13 12 6 7 10 1 15 0
+13 11 8 9 0 15 7 10 4 3 6 14 5 12 2 1
+5 9 13 14 6 3 7 12 10 8 4 0 15 2 11 1
+14 1 9 6 4 8 12 5 7 2 3 0 10 11 13 15
+3 6 5 2 10 0 15 14 1 4 13 12 9 8 11 7
+7 6 8 1 11 5 14 10 3 4 9 13 15 2 0 12
+13 11 4 12 1 8 9 15 6 5 14 2 7 3 10 0
+1 3 2 5 10 9 15 6 8 14 13 11 12 4 7 0
+15 14 0 4 11 1 6 13 7 5 8 9 3 2 10 12
+6 0 14 12 1 15 9 10 11 4 7 2 8 3 5 13
+7 11 8 3 14 0 6 15 1 4 13 9 5 12 2 10
+6 12 11 3 13 7 9 15 2 14 8 10 4 1 5 0
+12 8 14 6 11 4 7 0 5 1 10 15 3 13 9 2
+14 3 9 1 15 8 4 5 11 7 10 13 0 2 12 6
+10 9 3 11 0 13 2 14 5 6 4 7 8 15 1 12
+7 3 14 13 4 1 10 8 5 12 9 11 2 15 6 0
+11 4 2 7 1 0 10 15 6 9 14 8 3 13 5 12
+5 7 3 12 15 13 14 8 0 10 9 6 1 4 2 11
+14 1 8 15 2 6 0 3 9 12 10 13 4 7 5 11
+13 14 6 12 4 5 1 0 9 3 10 2 15 11 8 7
+9 8 0 2 15 1 4 14 3 10 7 5 11 13 6 12
+12 15 2 6 1 14 4 8 5 3 7 0 10 13 9 11
+12 8 15 13 1 0 5 4 6 3 2 11 9 7 14 10
+14 10 9 4 13 6 5 8 2 12 7 0 1 3 11 15
+14 3 5 15 11 6 13 9 0 10 2 12 4 1 7 8
+6 11 7 8 13 2 5 4 1 10 3 9 14 0 12 15
+1 6 12 14 3 2 15 8 4 5 13 9 0 7 11 10
+12 6 0 4 7 3 15 1 13 9 8 11 2 14 5 10
+8 1 7 12 11 0 10 5 9 15 6 13 14 2 3 4
+7 15 8 2 13 6 3 12 11 0 4 10 9 5 1 14
+9 0 4 10 1 14 15 3 12 6 5 7 11 13 8 2
+11 5 1 14 4 12 10 0 2 7 13 3 9 15 6 8
+8 13 10 9 11 3 15 6 0 1 2 14 12 5 4 7
+4 5 7 2 9 14 12 13 0 3 6 11 8 1 15 10
+11 15 14 13 1 9 10 4 3 6 2 12 7 5 8 0
+12 9 0 6 8 3 5 14 2 4 11 7 10 1 15 13
+3 14 9 7 12 15 0 4 1 8 5 6 11 10 2 13
+8 4 6 1 14 12 2 15 13 10 9 5 3 7 0 11
+6 10 1 14 15 8 3 5 13 0 2 7 4 9 11 12
+8 11 4 6 7 3 10 9 2 12 15 13 0 1 5 14
+10 0 2 4 5 1 6 12 11 13 9 7 15 3 14 8
+12 5 13 11 2 10 0 9 7 8 4 3 14 6 15 1
+10 2 8 4 15 0 1 14 11 13 3 6 9 7 5 12
+10 8 0 12 3 7 6 2 1 14 4 11 15 13 9 5
+14 9 12 13 15 4 8 10 0 2 1 7 3 11 5 6
+12 11 0 8 10 2 13 15 5 4 7 3 6 9 14 1
+13 8 14 3 9 1 0 7 15 5 4 10 12 2 6 11
+3 15 2 5 11 6 4 7 12 9 1 0 13 14 10 8
+5 11 6 9 4 13 12 0 8 2 15 10 1 7 3 14
+5 0 15 8 4 6 1 14 10 11 3 9 7 12 2 13
+15 14 6 7 10 1 0 11 12 8 4 9 2 5 13 3
+11 14 13 1 2 3 12 4 15 7 9 5 10 6 8 0
+6 13 3 2 11 9 5 10 1 7 12 14 8 4 0 15
+4 6 12 0 14 2 9 13 11 8 3 15 7 10 1 5
+8 10 9 11 14 1 7 15 13 4 0 12 6 2 5 3
+5 2 14 0 7 8 6 3 11 12 13 15 4 10 9 1
+7 8 3 2 10 12 4 6 11 13 5 15 0 1 9 14
+11 6 14 12 3 5 1 15 8 0 10 13 9 7 4 2
+7 1 2 4 8 3 6 11 10 15 0 5 14 12 13 9
+7 3 1 13 12 10 5 2 8 0 6 11 14 15 4 9
+6 0 5 15 1 14 4 9 2 13 8 10 11 12 7 3
+15 1 3 12 4 0 6 5 2 8 14 9 13 10 7 11
+5 7 0 11 12 1 9 10 15 6 2 3 8 4 13 14
+12 15 11 10 4 5 14 0 13 7 1 2 9 8 3 6
+6 14 10 5 15 8 7 1 3 4 2 0 12 9 11 13
+14 13 4 11 15 8 6 9 0 7 3 1 2 10 12 5
+14 4 0 10 6 5 1 3 9 2 13 15 12 7 8 11
+15 10 8 3 0 6 9 5 1 14 13 11 7 2 12 4
+0 13 2 4 12 14 6 9 15 1 10 3 11 5 8 7
+3 14 13 6 4 15 8 9 5 12 10 0 2 7 1 11
+0 1 9 7 11 13 5 3 14 12 4 2 8 6 10 15
+11 0 15 8 13 12 3 5 10 1 4 6 14 9 7 2
+13 0 9 12 11 6 3 5 15 8 1 10 4 14 2 7
+14 10 2 1 13 9 8 11 7 3 6 12 15 5 4 0
+12 3 9 1 4 5 10 2 6 11 15 0 14 7 13 8
+15 8 10 7 0 12 14 1 5 9 6 3 13 11 4 2
+4 7 13 10 1 2 9 6 12 8 14 5 3 0 11 15
+6 0 5 10 11 12 9 2 1 7 4 3 14 8 13 15
+9 5 11 10 13 0 2 1 8 6 14 12 4 7 3 15
+15 2 12 11 14 13 9 5 1 3 8 7 0 10 6 4
+11 1 7 4 10 13 3 8 9 14 0 15 6 5 2 12
+5 4 7 1 11 12 14 15 10 13 8 6 2 0 9 3
+9 7 5 2 14 15 12 10 11 3 6 1 8 13 0 4
+3 2 7 9 0 15 12 4 6 11 5 14 8 13 10 1
+13 9 14 6 12 8 1 2 3 4 0 7 5 10 11 15
+5 7 11 8 0 14 9 13 10 12 3 15 6 1 4 2
+4 3 6 13 7 15 9 0 10 5 8 11 2 12 1 14
+1 7 15 14 2 6 4 9 12 11 13 3 0 8 5 10
+9 14 5 7 8 15 1 2 10 4 13 6 12 0 11 3
+0 11 3 12 5 2 1 9 8 10 14 15 7 4 13 6
+7 15 4 0 10 9 2 5 12 11 13 6 1 3 14 8
+11 4 0 8 6 10 5 13 12 7 14 3 1 2 9 15
+"""
+
+
+def suite_instances(name, count=None):
+    spec = SUITES[name]
+    size = spec["size"]
+    kind = spec["kind"]
+    count = count or spec["count"]
+    if kind == "korf":
+        return size, [from_blank_first([int(v) for v in line.split()])
+                      for line in KORF100.splitlines()[:count]]
+    if kind == "walk":
+        rng = random.Random(spec["seed"])
+        return size, [shuffle_board(size, spec["steps"], rng)
+                      for _ in range(count)]
+    band = spec.get("band")
+    return size, list(random_instances(size, count, band, seed=spec["seed"]))
+
+
+# ─────────────────────────────────────────────
+# RUNNING
+# ─────────────────────────────────────────────
+
+def _peak_rss_kb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _tables_read(size, engine, heuristic, endgame):
+    """Names of the table files the pair's searches could read."""
+    goal = tuple(make_goal(size))
+    used = []
+    if engine in USES_HEURISTIC:
+        used.append(get_heuristic(heuristic, goal, size))
+    if endgame:
+        used.append(get_endgame(goal, size))
+    return sorted(os.path.basename(t.path) for t in used
+                  if getattr(t, "path", None))
+
+
+def _run_pair(boards, size, engine, heuristic, limit, endgame=False):
+    """
+    Runs in a child process; returns (records, peak RSS in KB, table
+    files read).
+    """
+    records = []
+    for i, board in enumerate(boards):
+        cancel = threading.Event()
+        timer = threading.Timer(limit, cancel.set)
+        timer.start()
+        start = time.perf_counter()
+        try:
+            rec = solve_one(board, size, engine, heuristic, cancel=cancel,
+                            endgame=endgame)
+        except SearchCancelled:
+            rec = {"timeout": True,
+                   "seconds": round(time.perf_counter() - start, 6)}
+        except (ValueError, LookupError) as exc:
+            return [{"error": str(exc)}], _peak_rss_kb(), []
+        finally:
+            timer.cancel()
+        records.append({"index": i, **rec})
+    return (records, _peak_rss_kb(),
+            _tables_read(size, engine, heuristic, endgame))
+
+
+def _pair_process(conn, args):
+    """
+    Child entry point.  A plain (non-daemon) process rather than a Pool
+    worker, so engines such as ida-parallel can start their own pools.
+    """
+    try:
+        conn.send(_run_pair(*args))
+    except Exception as exc:
+        conn.send(([{"error": f"{type(exc).__name__}: {exc}"}], 0, []))
+    finally:
+        conn.close()
+
+
+def summarize(records):
+    ok = [r for r in records if r.get("solved")]
+    seconds = sum(r.get("seconds", 0) for r in records)
+    nodes = sum(r.get("nodes", 0) for r in records)
+    return {
+        "instances":     len(records),
+        "solved":        len(ok),
+        "timeouts":      sum(1 for r in records if r.get("timeout")),
+        "seconds":       round(seconds, 3),
+        "nodes":         nodes,
+        "nodes_per_sec": round(nodes / seconds) if seconds else None,
+        "mean_length":   (round(sum(r["length"] for r in ok) / len(ok), 2)
+                          if ok else None),
+        "suboptimal":    sum(1 for r in ok if r.get("optimal") is not None
+                             and r["length"] != r["optimal"]),
+    }
+
+
+def _pairs(engines, heuristics):
+    for engine in engines:
+        if engine in USES_HEURISTIC:
+            for h in heuristics:
+                yield engine, h
+        else:
+            yield engine, NO_HEURISTIC
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             cwd=HERE, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run(suites, engines, heuristics, count=None, limit=60.0, log=sys.stderr,
+        endgame=False):
+    ctx = mp.get_context("spawn")
+    results = []
+    tables = set()
+    for name in suites:
+        size, boards = suite_instances(name, count)
+        for engine, heuristic in _pairs(engines, heuristics):
+            # a fresh process per pair so ru_maxrss is this pair's alone
+            recv, send = ctx.Pipe(duplex=False)
+            child = ctx.Process(target=_pair_process,
+                                args=(send, (boards, size, engine,
+                                             heuristic, limit, endgame)))
+            child.start()
+            send.close()
+            try:
+                records, rss, used = recv.recv()
+            except EOFError:
+                child.join()
+                records, rss, used = [{"error": f"worker exited with code "
+                                                f"{child.exitcode}"}], 0, []
+            child.join()
+            entry = {"suite": name, "size": size, "engine": engine,
+                     "heuristic": heuristic}
+            if records and "error" in records[0]:
+                entry["error"] = records[0]["error"]
+            else:
+                entry.update(summarize(records), peak_rss_kb=rss,
+                             tables=used, records=records)
+                tables.update(used)
+            results.append(entry)
+            print(_row(entry), file=log, flush=True)
+    return {
+        "meta": {
+            "commit":   _commit(),
+            "python":   platform.python_version(),
+            "machine":  platform.machine(),
+            "cpus":     os.cpu_count(),
+            "limit":    limit,
+            "count":    count,
+            "endgame":  endgame,
+            "tables":   sorted(tables),
+            "time":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def _row(e):
+    head = f"{e['suite']:<11} {e['engine']:<12} {e['heuristic']:<16}"
+    if "error" in e:
+        return f"{head} error: {e['error']}"
+    return (f"{head} {e['solved']:>3}/{e['instances']:<3} "
+            f"{e['seconds']:>9.3f}s {e['nodes_per_sec'] or 0:>9} n/s "
+            f"len {e['mean_length']} rss {e['peak_rss_kb']} KB"
+            + (f" {e['suboptimal']} SUBOPTIMAL" if e["suboptimal"] else ""))
+
+
+# ─────────────────────────────────────────────
+# COMPARING
+# ─────────────────────────────────────────────
+
+def compare(old, new, out=sys.stdout):
+    """Print time ratios per pair and flag changed solution lengths."""
+    old_tables = old["meta"].get("tables")
+    new_tables = new["meta"].get("tables")
+    if old_tables != new_tables:
+        print(f"warning: table files differ: {old_tables} -> {new_tables}",
+              file=out)
+    key = lambda e: (e["suite"], e["engine"], e["heuristic"])
+    before = {key(e): e for e in old["results"] if "error" not in e}
+    for e in new["results"]:
+        b = before.get(key(e))
+        if b is None or "error" in e:
+            continue
+        ratio = e["seconds"] / b["seconds"] if b["seconds"] else float("nan")
+        lengths = {r["index"]: r.get("length") for r in b["records"]}
+        changed = sum(1 for r in e["records"]
+                      if r.get("solved") and lengths.get(r["index"]) is not None
+                      and lengths[r["index"]] != r["length"])
+        note = f"  {changed} lengths changed" if changed else ""
+        print(f"{' '.join(key(e)):<42} time x{ratio:.2f}  "
+              f"rss {b['peak_rss_kb']} -> {e['peak_rss_kb']} KB{note}",
+              file=out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--suites", default=",".join(SUITES),
+                    help="comma-separated suite names")
+    ap.add_argument("--engines", default="ida,bidir",
+                    help="comma-separated engines (see cli.py)")
+    ap.add_argument("--heuristics", default="manhattan,linear_conflict,auto",
+                    help="heuristics for the ida and astar engines")
+    ap.add_argument("--count", type=int,
+                    help="instances per suite (default: the suite's own)")
+    ap.add_argument("--limit", type=float, default=60.0,
+                    help="seconds per instance before it counts as a timeout")
+    ap.add_argument("--endgame", action="store_true",
+                    help="let searches use the endgame tables that are built")
+    ap.add_argument("--out", help="write the JSON results here")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                    help="compare two result files and exit")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as a, open(args.compare[1]) as b:
+            compare(json.load(a), json.load(b))
+        return
+    unknown = set(args.suites.split(",")) - set(SUITES)
+    if unknown:
+        ap.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    report = run(args.suites.split(","), args.engines.split(","),
+                 args.heuristics.split(","), args.count, args.limit,
+                 endgame=args.endgame)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
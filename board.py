@@ -0,0 +1,194 @@
+"""
+Board representations shared by the games and the solvers.
+
+Packed boards
+    A board fits in one int with a fixed number of bits per cell (4 for
+    boards up to 4x4, so a 15-puzzle state is a 64-bit int).  Cell i
+    lives at bits [i*bits, (i+1)*bits).  The blank position is tracked
+    next to the int, so a move is two shifts and an add, and hashing,
+    equality and set membership are plain int operations.
+
+Move tables
+    move_table(size)[blank] lists the cells whose tile can slide into the
+    blank.  It is built once per size, so callers that track the blank
+    index never need divmod, bounds checks or index(0).
+
+Random instances
+    random_board() draws a uniformly random solvable board straight from
+    a shuffled permutation rather than a random walk, so instances are
+    neither shallow nor correlated; random_instances() streams them,
+    optionally keeping only those whose heuristic value falls in a band.
+
+Nothing here imports tkinter, so the solvers and the command-line tools
+can use it on machines without a display.
+"""
+import random
+from functools import lru_cache
+
+
+# ─────────────────────────────────────────────
+# MOVE TABLES
+# ─────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def move_table(size):
+    table = []
+    for e in range(size * size):
+        r, c = divmod(e, size)
+        out = []
+        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
+            nr, nc = r+dr, c+dc
+            if 0 <= nr < size and 0 <= nc < size:
+                out.append(nr * size + nc)
+        table.append(tuple(out))
+    return tuple(table)
+
+
+# ─────────────────────────────────────────────
+# BOARD HELPERS
+# ─────────────────────────────────────────────
+
+def make_goal(size):
+    return list(range(1, size * size)) + [0]
+
+
+def get_moves(board, size, blank=None):
+    if blank is None:
+        blank = board.index(0)
+    return move_table(size)[blank]
+
+
+def apply_move(board, idx, blank=None):
+    b = list(board)
+    e = b.index(0) if blank is None else blank
+    b[e], b[idx] = b[idx], b[e]
+    return tuple(b)
+
+
+def count_correct(board, goal):
+    """Tiles (not counting the blank) already on their goal cell."""
+    return sum(1 for v, g in zip(board, goal) if v == g and v != 0)
+
+
+def permutation_parity(board, goal=None):
+    """0 or 1: parity of the permutation taking goal to board, by cycles."""
+    n = len(board)
+    if goal is None:
+        target = [(v - 1) % n for v in board]       # blank last
+    else:
+        where = {v: i for i, v in enumerate(goal)}
+        target = [where[v] for v in board]
+    seen = bytearray(n)
+    cycles = 0
+    for i in range(n):
+        if not seen[i]:
+            cycles += 1
+            while not seen[i]:
+                seen[i] = 1
+                i = target[i]
+    return (n - cycles) & 1
+
+
+def is_solvable(board, size, goal=None):
+    """
+    Parity test: every move is one transposition and moves the blank one
+    cell, so board is reachable exactly when the permutation parity
+    matches the parity of the blank's distance from its goal cell.
+    goal defaults to the standard one (1..N-1, blank last).
+    """
+    e = board.index(0)
+    g = len(board) - 1 if goal is None else list(goal).index(0)
+    dist = abs(e // size - g // size) + abs(e % size - g % size)
+    return permutation_parity(board, goal) == dist & 1
+
+
+def shuffle_board(size, steps=12, rng=random):
+    b = make_goal(size)
+    e = len(b) - 1
+    moves = move_table(size)
+    for _ in range(steps):
+        idx = rng.choice(moves[e])
+        b[e], b[idx] = b[idx], 0
+        e = idx
+    return b
+
+
+# ─────────────────────────────────────────────
+# RANDOM INSTANCES
+# ─────────────────────────────────────────────
+
+def random_board(size, rng=random, goal=None):
+    """
+    Uniformly random solvable board.  Half of all permutations are
+    unsolvable; swapping two fixed tiles maps those one-to-one onto the
+    solvable half, so the result stays uniform.
+    """
+    cells = list(range(size * size))
+    rng.shuffle(cells)
+    if not is_solvable(cells, size, goal):
+        i, j = [k for k, v in enumerate(cells) if v][:2]
+        cells[i], cells[j] = cells[j], cells[i]
+    return cells
+
+
+def random_instances(size, count=None, band=None, heuristic="manhattan",
+                     seed=None, goal=None):
+    """
+    Yield count random solvable boards (forever if count is None) from a
+    generator seeded with seed.  band=(lo, hi) keeps only boards whose
+    heuristic value lies in [lo, hi], as a cheap difficulty filter.
+    """
+    rng = random.Random(seed)
+    goal = tuple(goal) if goal is not None else tuple(make_goal(size))
+    if band is not None:
+        from heuristics import get_heuristic
+        lo, hi = band
+        if lo > hi:
+            raise ValueError(f"empty difficulty band: {band!r}")
+        h = get_heuristic(heuristic, goal, size).h
+    std = goal == tuple(make_goal(size))
+    made = 0
+    while count is None or made < count:
+        b = random_board(size, rng, None if std else goal)
+        if band is not None and not lo <= h(b) <= hi:
+            continue
+        made += 1
+        yield b
+
+
+# ─────────────────────────────────────────────
+# PACKED BOARDS
+# ─────────────────────────────────────────────
+
+def cell_bits(size):
+    return max(1, (size * size - 1).bit_length())
+
+
+def pack(board, size=4):
+    bits = cell_bits(size)
+    state = 0
+    for i, v in enumerate(board):
+        state |= v << (i * bits)
+    return state
+
+
+def unpack(state, size=4):
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    return tuple((state >> (i * bits)) & mask for i in range(size * size))
+
+
+def packed_tile(state, idx, size=4):
+    bits = cell_bits(size)
+    return (state >> (idx * bits)) & ((1 << bits) - 1)
+
+
+def packed_move(state, blank, idx, size=4):
+    """Slide the tile at idx into the blank; the new blank is idx."""
+    bits = cell_bits(size)
+    tile = (state >> (idx * bits)) & ((1 << bits) - 1)
+    return state - (tile << (idx * bits)) + (tile << (blank * bits))
+
+
+def packed_goal(size=4):
+    return pack(list(range(1, size * size)) + [0], size)
@@ -0,0 +1,252 @@
+"""
+Headless batch solver.
+
+Reads one puzzle per line (cell values separated by spaces or commas,
+0 for the blank; the board size follows from the count) from a file or
+stdin and writes one JSON object per line:
+
+    python cli.py instances.txt --engine ida --heuristic auto
+    python cli.py instances.txt --jobs 8
+    echo "1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15" | python cli.py
+
+--random N solves N uniformly random solvable boards instead of reading
+a file (--size, --seed, and --band LO:HI to keep only boards whose
+Manhattan distance is in range); --emit just prints them, ready to be
+fed back in:
+
+    python cli.py --random 1000 --size 4 --band 40:50 --seed 1 --emit
+
+With --jobs the instances are spread over a process pool in chunks and
+results are still written in input order.  Heuristic tables are built
+(or memory-mapped) once in the parent before the pool forks, so workers
+share them instead of each building a copy.
+
+Where an exact distance table has been built (3x3, see distance_table.py)
+each record also carries the true optimum as "optimal".
+
+Endgame databases (endgame.py) are only used with --endgame, so node
+counts measure the chosen heuristic and do not change when a table
+file happens to be built.
+
+Never imports tkinter.
+"""
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from backtrack import PureBacktrackSolver
+from board import is_solvable, make_goal, random_instances
+from endgame import get_endgame
+from distance_table import get_distance_table
+from heuristics import get_heuristic
+from solver import a_star, bidirectional_search, ida_star, parallel_ida_star
+from transposition import TranspositionTable
+
+ENGINES = ("ida", "ida-parallel", "astar", "bidir", "backtrack")
+HEURISTIC_ENGINES = ("ida", "ida-parallel", "astar")
+
+
+def parse_board(line):
+    cells = [int(tok) for tok in line.replace(",", " ").split()]
+    size = math.isqrt(len(cells))
+    if size < 2 or size * size != len(cells):
+        raise ValueError(f"{len(cells)} cells is not a square board")
+    if sorted(cells) != list(range(size * size)):
+        raise ValueError("cells must be 0..N-1, each exactly once")
+    if not is_solvable(cells, size):
+        raise ValueError("board is not solvable")
+    return cells, size
+
+
+def solve_one(board, size, engine="ida", heuristic="auto", tt_mb=0,
+              cancel=None, endgame=False):
+    """
+    Solve one board and return the result record (without line number).
+    cancel, a threading.Event, stops the ida, astar and bidir engines with
+    SearchCancelled.  With endgame the IDA* searches (and the fallbacks
+    of astar and bidir) stop at the endgame table built for this size.
+    """
+    goal  = make_goal(size)
+    start = time.perf_counter()
+    if engine in ("ida", "ida-parallel", "astar", "bidir"):
+        solve = {"ida": ida_star, "ida-parallel": parallel_ida_star,
+                 "astar": a_star, "bidir": bidirectional_search}[engine]
+        stats = {}
+        moves = solve(board, goal, size, heuristic=heuristic, cancel=cancel,
+                      stats=stats, endgame="auto" if endgame else None)
+        nodes = stats.get("nodes", 0)
+        length = None if moves is None else len(moves)
+    elif engine == "backtrack":
+        depth = nodes = 0
+        length = None
+        table = TranspositionTable(max_mb=tt_mb) if tt_mb else None
+        solver = PureBacktrackSolver(board, size, goal, table)
+        for action, _, _ in solver.events():
+            if action == "try":
+                nodes += 1
+                depth += 1
+            elif action == "back":
+                depth -= 1
+            else:
+                length = depth
+    else:
+        raise ValueError(f"unknown engine: {engine!r}")
+    record = {
+        "size":    size,
+        "engine":  engine,
+        "solved":  length is not None,
+        "length":  length,
+        "nodes":   nodes,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+    exact = get_distance_table(tuple(goal), size)
+    if exact is not None:
+        record["optimal"] = exact.distance(board)
+    return record
+
+
+def read_instances(stream):
+    """Yield (line number, text) for every non-blank, non-comment line."""
+    for n, line in enumerate(stream, 1):
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield n, line
+
+
+def solve_line(n, line, engine, heuristic, tt_mb=0, endgame=False):
+    try:
+        board, size = parse_board(line)
+        return {"line": n, **solve_one(board, size, engine, heuristic, tt_mb,
+                                       endgame=endgame)}
+    except (ValueError, LookupError) as exc:
+        return {"line": n, "error": str(exc)}
+
+
+# ─────────────────────────────────────────────
+# PARALLEL BATCHES
+# ─────────────────────────────────────────────
+
+_worker_args = None
+
+
+def _init_worker(engine, heuristic, tt_mb, endgame):
+    global _worker_args
+    _worker_args = (engine, heuristic, tt_mb, endgame)
+
+
+def _solve_task(task):
+    return solve_line(*task, *_worker_args)
+
+
+def _preload(instances, engine, heuristic, endgame=False):
+    """Build every table the batch needs before the workers fork."""
+    if engine not in HEURISTIC_ENGINES:
+        return
+    sizes = set()
+    for _, line in instances:
+        n = len(line.replace(",", " ").split())
+        if math.isqrt(n) ** 2 == n:
+            sizes.add(math.isqrt(n))
+    for size in sizes:
+        if endgame:
+            get_endgame(tuple(make_goal(size)), size)
+        try:
+            get_heuristic(heuristic, make_goal(size), size)
+        except (ValueError, LookupError):
+            pass        # reported per instance by the workers
+
+
+def _pool_context():
+    # fork shares the parent's tables copy-on-write
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+def run(stream, out, engine, heuristic, jobs=1, chunksize=16, tt_mb=0,
+        endgame=False):
+    if jobs == 1:
+        records = (solve_line(n, line, engine, heuristic, tt_mb, endgame)
+                   for n, line in read_instances(stream))
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+        return
+
+    instances = list(read_instances(stream))
+    _preload(instances, engine, heuristic, endgame)
+    with _pool_context().Pool(jobs, _init_worker,
+                              (engine, heuristic, tt_mb, endgame)) as pool:
+        # imap keeps input order no matter which worker finishes first
+        for record in pool.imap(_solve_task, instances, chunksize):
+            out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def _band(text):
+    try:
+        lo, hi = (int(x) for x in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LO:HI, got {text!r}")
+    if lo > hi:
+        raise argparse.ArgumentTypeError(f"empty band: {text!r}")
+    return lo, hi
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("file", nargs="?", default="-",
+                    help="instances, one per line ('-' for stdin)")
+    ap.add_argument("--engine", choices=ENGINES, default="ida")
+    ap.add_argument("--heuristic", default="auto",
+                    help="manhattan, linear_conflict, walking_distance, "
+                         "pdb, pdb:<partition>, exact or auto (ida and astar "
+                         "engines only)")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="worker processes (0 = one per CPU)")
+    ap.add_argument("--chunksize", type=int, default=16,
+                    help="instances handed to a worker at a time")
+    ap.add_argument("--tt-mb", type=float, default=0,
+                    help="transposition table budget in MB per process "
+                         "(backtrack engine only; 0 = off)")
+    ap.add_argument("--endgame", action="store_true",
+                    help="stop searches at the endgame table, if one is built")
+    ap.add_argument("--random", type=int, metavar="N",
+                    help="use N random solvable boards instead of a file")
+    ap.add_argument("--size", type=int, default=4,
+                    help="board size for --random")
+    ap.add_argument("--seed", type=int, help="seed for --random")
+    ap.add_argument("--band", type=_band, metavar="LO:HI",
+                    help="keep random boards with Manhattan distance in range")
+    ap.add_argument("--emit", action="store_true",
+                    help="print the random boards instead of solving them")
+    args = ap.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.engine == "ida-parallel" and jobs > 1:
+        ap.error("ida-parallel already uses every core; run it with --jobs 1")
+
+    if args.random is not None:
+        boards = random_instances(args.size, args.random, args.band,
+                                  seed=args.seed)
+        lines = (" ".join(map(str, b)) for b in boards)
+        if args.emit:
+            for line in lines:
+                sys.stdout.write(line + "\n")
+        else:
+            run(lines, sys.stdout, args.engine, args.heuristic,
+                jobs, args.chunksize, args.tt_mb, args.endgame)
+    elif args.file == "-":
+        run(sys.stdin, sys.stdout, args.engine, args.heuristic,
+            jobs, args.chunksize, args.tt_mb, args.endgame)
+    else:
+        with open(args.file) as f:
+            run(f, sys.stdout, args.engine, args.heuristic,
+                jobs, args.chunksize, args.tt_mb, args.endgame)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Perfect distance tables.
+
+The exact distance to the goal of every solvable board, one byte each,
+indexed by ranking.rank_solvable(), so a lookup is one rank and one byte
+read with no keys stored at all.  The table is filled by a single
+breadth-first search from the goal and saved to one versioned file next
+to this module:
+
+    python distance_table.py            (3x3: 181,440 boards, 1 s)
+
+Only the 3x3 board is small enough: 4x4 would need 10^13 bytes.
+
+With exact distances the best move is any neighbour one step closer, so
+optimal CPU moves cost O(1), and the table doubles as an "exact"
+heuristic that lets IDA* walk straight to the goal.  It is also ground
+truth for checking the other solvers' solution lengths.
+"""
+import os
+import sys
+from functools import lru_cache
+
+from board import is_solvable, make_goal, move_table
+from ranking import rank_solvable, table_size
+from tablefile import MappedTable, map_table, write_table
+
+VERSION = 1
+MAGIC   = b"SDTB"
+HERE    = os.path.dirname(os.path.abspath(__file__))
+HEADER  = "<4sHBI"
+
+SIZES   = (3,)
+UNSEEN  = 255
+
+
+def dtb_path(size):
+    return os.path.join(HERE, f"distance_{size}x{size}.v{VERSION}.dtb")
+
+
+# ─────────────────────────────────────────────
+# BUILDING
+# ─────────────────────────────────────────────
+
+def build_distances(goal, size):
+    """Breadth-first search from the goal over every solvable board."""
+    n     = size * size
+    nbrs  = move_table(size)
+    dist  = bytearray([UNSEEN]) * (table_size(n, n) // 2)
+    dist[rank_solvable(goal)] = 0
+    level = [(list(goal), list(goal).index(0))]
+    d = 0
+    while level:
+        d += 1
+        nxt = []
+        for board, blank in level:
+            for idx in nbrs[blank]:
+                child = board[:]
+                child[blank], child[idx] = child[idx], 0
+                r = rank_solvable(child)
+                if dist[r] == UNSEEN:
+                    dist[r] = d
+                    nxt.append((child, idx))
+        level = nxt
+    return dist
+
+
+# ─────────────────────────────────────────────
+# FILE FORMAT
+# ─────────────────────────────────────────────
+#   magic 4s | version H | size B | count I
+#   goal: n bytes
+#   distances: count bytes, indexed by rank_solvable
+
+def save_dtb(path, goal, size, dist):
+    write_table(path, HEADER, MAGIC, VERSION, size, (len(dist),), goal,
+                (dist,))
+
+
+# ─────────────────────────────────────────────
+# LOOKUPS
+# ─────────────────────────────────────────────
+
+class DistanceTable(MappedTable):
+    name = "exact"
+
+    def __init__(self, goal, size, dist, _mmap=None, path=None):
+        super().__init__(_mmap, path)
+        self.goal  = tuple(goal)
+        self.size  = size
+        self.dist  = dist
+        self.nbrs  = move_table(size)
+
+    def __len__(self):
+        return len(self.dist)
+
+    def h(self, board):
+        """
+        Heuristic protocol.  Only defined for solvable boards: ranks leave
+        out the two highest tiles, so an unsolvable board reads its
+        solvable twin's distance.  The search engines check parity before
+        they start, and distance() checks it on every call.
+        """
+        return self.dist[rank_solvable(board)]
+
+    def update(self, board, h, tile, frm, to):
+        return self.dist[rank_solvable(board)]
+
+    def distance(self, board):
+        """Exact distance to the goal, or None if board is unsolvable."""
+        if not is_solvable(board, self.size, self.goal):
+            return None
+        return self.dist[rank_solvable(board)]
+
+    def lookup(self, board):
+        """(distance, optimal next move) or None; the move is None at the goal."""
+        d = self.distance(board)
+        if d is None:
+            return None
+        if d == 0:
+            return 0, None
+        b = list(board)
+        e = b.index(0)
+        for idx in self.nbrs[e]:
+            b[e], b[idx] = b[idx], 0
+            closer = self.dist[rank_solvable(b)] < d
+            b[idx], b[e] = b[e], 0
+            if closer:
+                return d, idx
+        raise AssertionError("distance table is inconsistent")
+
+    def solution(self, board):
+        """Optimal moves from board to the goal, or None if unsolvable."""
+        found = self.lookup(board)
+        if found is None:
+            return None
+        b = list(board)
+        moves = []
+        while found[1] is not None:
+            idx = found[1]
+            e = b.index(0)
+            b[e], b[idx] = b[idx], 0
+            moves.append(idx)
+            found = self.lookup(b)
+        return moves
+
+
+def build_dtb(goal, size):
+    save_dtb(dtb_path(size), goal, size, build_distances(tuple(goal), size))
+    return load_dtb(goal, size)
+
+
+def load_dtb(goal, size):
+    """Memory-map a previously built table, or None if there is none."""
+    path   = dtb_path(size)
+    mapped = map_table(path, HEADER, MAGIC, VERSION, size, goal,
+                       "distance table")
+    if mapped is None:
+        return None
+    mm, (count,), off = mapped
+    return DistanceTable(goal, size, memoryview(mm)[off:off + count],
+                         _mmap=mm, path=path)
+
+
+@lru_cache(maxsize=None)
+def get_distance_table(goal, size, build=False):
+    """
+    The table for this board, loaded once, or None.  With build=True a
+    missing table for a size in SIZES is built and saved first.
+    """
+    table = load_dtb(tuple(goal), size)
+    if table is None and build and size in SIZES:
+        table = build_dtb(tuple(goal), size)
+    return table
+
+
+if __name__ == "__main__":
+    size  = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    if size not in SIZES:
+        sys.exit(f"a full distance table is only practical for "
+                 f"{', '.join(f'{s}x{s}' for s in SIZES)}")
+    table = build_dtb(tuple(make_goal(size)), size)
+    print(f"wrote {dtb_path(size)} ({len(table):,} boards)")
@@ -0,0 +1,225 @@
+"""
+Near-goal endgame databases.
+
+Every board within `depth` moves of the goal, with its exact distance and
+the direction of an optimal first move, found by a breadth-first search
+backwards from the goal and saved to one versioned file next to this
+module:
+
+    python endgame.py 4 20
+    python endgame.py 5 16
+    python endgame.py 3            (depth 31 covers every 3x3 board)
+
+Each board is keyed by board.pack() written as fixed-width big-endian
+bytes, so keys sort like the ints they encode.  Keys are stored sorted
+and a board's rank among them is its slot in the value array: a minimal
+perfect hash of the key set that needs no extra tables and is found by
+binary search straight on the memory map.  Each value is one byte,
+distance in the low six bits and blank direction in the top two.
+
+At run time load_edb() maps the file read-only, so startup costs one
+mmap() no matter how big the table is.
+"""
+import os
+import sys
+from bisect import bisect_left
+from functools import lru_cache
+
+from board import cell_bits, move_table, pack, packed_move
+from pruning import STEPS
+from tablefile import MappedTable, map_table, write_table
+
+VERSION = 1
+MAGIC   = b"SEDB"
+HERE    = os.path.dirname(os.path.abspath(__file__))
+HEADER  = "<4sHBBI"
+
+DEFAULT_DEPTH = {3: 31, 4: 20, 5: 16}
+MAX_DEPTH     = 63              # distances get six bits
+
+
+def edb_path(size, depth):
+    return os.path.join(HERE, f"endgame_{size}x{size}_d{depth}.v{VERSION}.edb")
+
+
+def key_width(size):
+    return (cell_bits(size) * size * size + 7) // 8
+
+
+# ─────────────────────────────────────────────
+# BUILDING
+# ─────────────────────────────────────────────
+
+def build_table(goal, size, depth):
+    """
+    Breadth-first search backwards from the goal.  Returns the sorted
+    packed states and their value bytes.  A state first reached from a
+    parent one move closer gets the direction that walks the blank back
+    to where the parent had it.
+    """
+    if depth > MAX_DEPTH:
+        raise ValueError(f"endgame depth is limited to {MAX_DEPTH}")
+    nbrs  = move_table(size)
+    start = pack(goal, size)
+    seen  = {start}
+    level = [(start, list(goal).index(0))]
+    entries = [start << 8]              # state << 8 | value
+    for d in range(1, depth + 1):
+        nxt = []
+        for state, blank in level:
+            for idx in nbrs[blank]:
+                child = packed_move(state, blank, idx, size)
+                if child in seen:
+                    continue
+                seen.add(child)
+                nxt.append((child, idx))
+                step = (blank // size - idx // size, blank % size - idx % size)
+                entries.append(child << 8 | STEPS.index(step) << 6 | d)
+        level = nxt
+        if not level:
+            break
+    entries.sort()
+    keys   = [e >> 8 for e in entries]
+    values = bytearray(e & 0xFF for e in entries)
+    return keys, values
+
+
+# ─────────────────────────────────────────────
+# FILE FORMAT
+# ─────────────────────────────────────────────
+#   magic 4s | version H | size B | depth B | count I
+#   goal: n bytes
+#   keys: count * key_width(size) bytes, sorted, big-endian
+#   values: count bytes
+
+def save_edb(path, goal, size, depth, keys, values):
+    width = key_width(size)
+    write_table(path, HEADER, MAGIC, VERSION, size, (depth, len(keys)), goal,
+                (b"".join(k.to_bytes(width, "big") for k in keys), values))
+
+
+# ─────────────────────────────────────────────
+# LOOKUPS
+# ─────────────────────────────────────────────
+
+class _Keys:
+    """Sorted fixed-width keys in a buffer, as a sequence bisect can search."""
+
+    def __init__(self, buf, offset, width, count):
+        self.buf    = buf           # mmap or bytes: slices are bytes
+        self.offset = offset
+        self.width  = width
+        self.count  = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * self.width
+        return self.buf[start:start + self.width]
+
+
+class EndgameTable(MappedTable):
+    def __init__(self, goal, size, depth, keys, values, _mmap=None,
+                 path=None):
+        super().__init__(_mmap, path)
+        self.goal   = tuple(goal)
+        self.size   = size
+        self.depth  = depth
+        self.width  = key_width(size)
+        self.keys   = keys
+        self.values = values
+        self.deltas = [dr * size + dc for dr, dc in STEPS]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _value(self, board):
+        key = pack(board, self.size).to_bytes(self.width, "big")
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.values[i]
+        return None
+
+    def distance(self, board):
+        """Exact distance to the goal, or None if it is more than depth."""
+        v = self._value(board)
+        return None if v is None else v & 63
+
+    def lookup(self, board):
+        """(distance, optimal next move) or None; the move is None at the goal."""
+        v = self._value(board)
+        if v is None:
+            return None
+        if v & 63 == 0:
+            return 0, None
+        return v & 63, list(board).index(0) + self.deltas[v >> 6]
+
+    def solution(self, board):
+        """Optimal moves from board to the goal, or None if out of range."""
+        v = self._value(board)
+        if v is None:
+            return None
+        b = list(board)
+        e = b.index(0)
+        moves = []
+        while v & 63:
+            idx = e + self.deltas[v >> 6]
+            b[e], b[idx] = b[idx], 0
+            moves.append(idx)
+            e = idx
+            v = self._value(b)
+        return moves
+
+
+def build_edb(goal, size, depth=None):
+    depth = depth or DEFAULT_DEPTH[size]
+    keys, values = build_table(tuple(goal), size, depth)
+    save_edb(edb_path(size, depth), goal, size, depth, keys, values)
+    return load_edb(goal, size, depth)
+
+
+def built_depths(size):
+    prefix = f"endgame_{size}x{size}_d"
+    suffix = f".v{VERSION}.edb"
+    return sorted(int(name[len(prefix):-len(suffix)])
+                  for name in os.listdir(HERE)
+                  if name.startswith(prefix) and name.endswith(suffix)
+                  and name[len(prefix):-len(suffix)].isdigit())
+
+
+def load_edb(goal, size, depth=None):
+    """
+    Memory-map a previously built table, or None if there is none.
+    Without a depth the deepest table built for this size is used.
+    """
+    if depth is None:
+        depths = built_depths(size)
+        if not depths:
+            return None
+        depth = depths[-1]
+    path   = edb_path(size, depth)
+    mapped = map_table(path, HEADER, MAGIC, VERSION, size, goal,
+                       "endgame database")
+    if mapped is None:
+        return None
+    mm, (fdepth, count), off = mapped
+    width = key_width(size)
+    keys  = _Keys(mm, off, width, count)
+    off  += count * width
+    return EndgameTable(goal, size, fdepth, keys,
+                        memoryview(mm)[off:off + count], _mmap=mm, path=path)
+
+
+@lru_cache(maxsize=None)
+def get_endgame(goal, size):
+    """The deepest table built for this board, loaded once, or None."""
+    return load_edb(tuple(goal), size)
+
+
+if __name__ == "__main__":
+    size  = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DEPTH[size]
+    goal  = tuple(list(range(1, size * size)) + [0])
+    table = build_edb(goal, size, depth)
+    print(f"wrote {edb_path(size, depth)} ({len(table):,} boards)")
@@ -0,0 +1,288 @@
+"""
+Admissible heuristics for the sliding puzzle.
+
+Every heuristic is built once per (goal, size) and exposes
+    h(board)                         full evaluation
+    update(board, h, tile, frm, to)  new value after `tile` slid frm -> to
+so search engines can keep h up to date in O(1) per move.
+"""
+from functools import lru_cache
+
+
+# ─────────────────────────────────────────────
+# MANHATTAN DISTANCE
+# ─────────────────────────────────────────────
+
+class Manhattan:
+    name = "manhattan"
+
+    def __init__(self, goal, size):
+        n = size * size
+        goal_pos = [0] * n
+        for i, v in enumerate(goal):
+            goal_pos[v] = i
+        # dist[tile][pos] — the blank contributes nothing
+        self.dist = []
+        for tile in range(n):
+            gr, gc = divmod(goal_pos[tile], size)
+            self.dist.append(tuple(0 if tile == 0 else
+                                   abs(p // size - gr) + abs(p % size - gc)
+                                   for p in range(n)))
+        self.size = size
+
+    def h(self, board):
+        dist = self.dist
+        return sum(dist[v][i] for i, v in enumerate(board))
+
+    def delta(self, tile, frm, to):
+        row = self.dist[tile]
+        return row[to] - row[frm]
+
+    def update(self, board, h, tile, frm, to):
+        row = self.dist[tile]
+        return h - row[frm] + row[to]
+
+
+# ─────────────────────────────────────────────
+# LINEAR CONFLICT
+# ─────────────────────────────────────────────
+
+def _lis(seq):
+    tails = []
+    for x in seq:
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        tails[lo:lo+1] = [x]
+    return len(tails)
+
+
+class LinearConflict(Manhattan):
+    """
+    Manhattan plus two moves for every tile that has to leave its goal
+    row (or column) to let another one past.  A line is keyed by the goal
+    slot of each tile that belongs in it, and the number of such tiles
+    out of order is looked up in a table built once per size.
+    """
+    name = "linear_conflict"
+
+    def __init__(self, goal, size):
+        super().__init__(goal, size)
+        n    = size * size
+        base = size + 1
+        goal_rc = [divmod(goal.index(t), size) for t in range(n)]
+
+        # row_code[tile][pos]: the tile's contribution to its row's key
+        self.row_code = [[0] * n for _ in range(n)]
+        self.col_code = [[0] * n for _ in range(n)]
+        for t in range(1, n):
+            gr, gc = goal_rc[t]
+            for p in range(n):
+                r, c = divmod(p, size)
+                if gr == r:
+                    self.row_code[t][p] = (gc + 1) * base ** c
+                if gc == c:
+                    self.col_code[t][p] = (gr + 1) * base ** r
+
+        # conflicts[key]: tiles to lift out of the line to make it ordered
+        self.conflicts = []
+        for key in range(base ** size):
+            slots = []
+            while key:
+                key, d = divmod(key, base)
+                if d:
+                    slots.append(d)
+            self.conflicts.append(len(slots) - _lis(slots))
+
+        self.rows = [tuple(range(r * size, r * size + size)) for r in range(size)]
+        self.cols = [tuple(range(c, n, size)) for c in range(size)]
+
+    def _key(self, board, cells, code):
+        return sum(code[board[p]][p] for p in cells)
+
+    def h(self, board):
+        conf = self.conflicts
+        extra = 0
+        for cells in self.rows:
+            extra += conf[self._key(board, cells, self.row_code)]
+        for cells in self.cols:
+            extra += conf[self._key(board, cells, self.col_code)]
+        return super().h(board) + 2 * extra
+
+    def update(self, board, h, tile, frm, to):
+        h = super().update(board, h, tile, frm, to)
+        size = self.size
+        if frm // size == to // size:
+            # sideways: only the two columns changed
+            lines, code = self.cols, self.col_code
+            a, b = lines[frm % size], lines[to % size]
+        else:
+            lines, code = self.rows, self.row_code
+            a, b = lines[frm // size], lines[to // size]
+        conf = self.conflicts
+        key_a = self._key(board, a, code)
+        key_b = self._key(board, b, code)
+        old = conf[key_a + code[tile][frm]] + conf[key_b - code[tile][to]]
+        return h + 2 * (conf[key_a] + conf[key_b] - old)
+
+
+# ─────────────────────────────────────────────
+# WALKING DISTANCE
+# ─────────────────────────────────────────────
+
+def _walking_table(start, size):
+    """
+    Distances of every (line x goal-line counts, blank line) state from
+    start, as a dict keyed by the packed state.  Counts use 3 bits each.
+    """
+    n     = size * size
+    shift = 3 * n
+    mask  = (1 << shift) - 1
+    dist  = {start: 0}
+    level = [start]
+    depth = 0
+    while level:
+        depth += 1
+        nxt = []
+        for key in level:
+            e = key >> shift
+            counts = key & mask
+            for r in (e - 1, e + 1):
+                if not 0 <= r < size:
+                    continue
+                for g in range(size):
+                    src = 3 * (r * size + g)
+                    if (counts >> src) & 7 == 0:
+                        continue
+                    new = (counts - (1 << src) + (1 << 3 * (e * size + g))
+                           | r << shift)
+                    if new not in dist:
+                        dist[new] = depth
+                        nxt.append(new)
+        level = nxt
+    return dist
+
+
+class WalkingDistance:
+    """
+    Walking distance: moves needed when only the row (column) each tile
+    is in counts, solved exactly by BFS over the per-line counts of tiles
+    grouped by their goal line.  Rows and columns are independent, so
+    their distances add.
+
+    The state space is 24,964 lines for 4x4 but too large to hold in a
+    dict for 5x5, so only boards up to 4x4 are supported.
+    """
+    name = "walking_distance"
+    MAX_SIZE = 4
+
+    def __init__(self, goal, size):
+        if size > self.MAX_SIZE:
+            raise ValueError(f"walking distance supports up to "
+                             f"{self.MAX_SIZE}x{self.MAX_SIZE} boards")
+        n     = size * size
+        shift = 3 * n
+        goal_rc = [divmod(goal.index(t), size) for t in range(n)]
+
+        # row_inc[tile][pos] sums to the packed state of the whole board
+        self.row_inc = [[0] * n for _ in range(n)]
+        self.col_inc = [[0] * n for _ in range(n)]
+        for p in range(n):
+            r, c = divmod(p, size)
+            self.row_inc[0][p] = r << shift
+            self.col_inc[0][p] = c << shift
+            for t in range(1, n):
+                gr, gc = goal_rc[t]
+                self.row_inc[t][p] = 1 << 3 * (r * size + gr)
+                self.col_inc[t][p] = 1 << 3 * (c * size + gc)
+
+        row_goal = self._key(goal, self.row_inc)
+        col_goal = self._key(goal, self.col_inc)
+        self.row_dist = _walking_table(row_goal, size)
+        self.col_dist = (self.row_dist if col_goal == row_goal
+                         else _walking_table(col_goal, size))
+        self.size = size
+
+    @staticmethod
+    def _key(board, inc):
+        return sum(inc[v][p] for p, v in enumerate(board))
+
+    def h(self, board):
+        return (self.row_dist[self._key(board, self.row_inc)]
+                + self.col_dist[self._key(board, self.col_inc)])
+
+    def update(self, board, h, tile, frm, to):
+        if frm // self.size == to // self.size:
+            inc, dist = self.col_inc, self.col_dist
+        else:
+            inc, dist = self.row_inc, self.row_dist
+        new = self._key(board, inc)
+        old = new - inc[tile][to] - inc[0][frm] + inc[tile][frm] + inc[0][to]
+        return h - dist[old] + dist[new]
+
+
+# ─────────────────────────────────────────────
+# TABLE CACHE
+# ─────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _build(cls, goal, size):
+    return cls(goal, size)
+
+
+def manhattan_table(goal, size):
+    """Shared Manhattan table for this goal, built on first use."""
+    return _build(Manhattan, tuple(goal), size)
+
+
+@lru_cache(maxsize=None)
+def _pattern_db(goal, size, label=None):
+    from patterndb import load_pdb
+    return load_pdb(goal, size, label)
+
+
+def _exact(goal, size):
+    from distance_table import get_distance_table
+    return get_distance_table(goal, size)
+
+
+HEURISTICS = {
+    "manhattan":        Manhattan,
+    "linear_conflict":  LinearConflict,
+    "walking_distance": WalkingDistance,
+}
+
+
+def get_heuristic(name, goal, size):
+    """
+    Heuristic by name: "manhattan", "linear_conflict", "walking_distance",
+    "pdb", "pdb:<partition>" (e.g. "pdb:663") or "exact".  "pdb" is any
+    pattern database built for this board.  "auto" (or None) picks the
+    exact distance table or the pattern database when one has been built
+    and falls back to linear conflict.
+    """
+    goal = tuple(goal)
+    if name in (None, "auto"):
+        return (_exact(goal, size) or _pattern_db(goal, size)
+                or _build(LinearConflict, goal, size))
+    if name in HEURISTICS:
+        return _build(HEURISTICS[name], goal, size)
+    if name == "pdb" or name.startswith("pdb:"):
+        label = name[4:] or None
+        db = _pattern_db(goal, size, label)
+        if db is None:
+            raise LookupError(f"no pattern database for {size}x{size}; "
+                              f"build it with: python patterndb.py {size} "
+                              f"{label or ''}".rstrip())
+        return db
+    if name == "exact":
+        table = _exact(goal, size)
+        if table is None:
+            raise LookupError(f"no distance table for {size}x{size}; "
+                              f"build it with: python distance_table.py")
+        return table
+    raise ValueError(f"unknown heuristic: {name!r}")
@@ -0,0 +1,85 @@
+"""
+Search instrumentation.
+
+Pass a SearchMetrics to an engine (ida_star, parallel_ida_star or
+PureBacktrackSolver) to see where the search spends its time:
+
+    nodes_by_depth   nodes generated at each depth
+    heuristic_calls  heuristic evaluations (one per generated node)
+    pruned           children skipped by move pruning or path checks
+    tt_hits          children skipped by the transposition table
+    iterations       one record per cost threshold: bound, nodes, seconds
+
+Engines only touch the object when one is given, so a search without
+metrics runs the same code it always did apart from a None test.
+
+Subscribers are called with the metrics object at the end of every
+iteration and every `every` nodes in between, on the thread running the
+search.  GUI code should hand snapshot() across threads rather than the
+live object (SolveService does this for on_metrics).
+"""
+import time
+
+
+class SearchMetrics:
+    def __init__(self, every=0x4000):
+        self.every           = every
+        self.nodes_by_depth  = []
+        self.heuristic_calls = 0
+        self.pruned          = 0
+        self.tt_hits         = 0
+        self.iterations      = []
+        self._subscribers    = []
+        self._started        = None
+        self._start_nodes    = 0
+
+    @property
+    def nodes(self):
+        return sum(self.nodes_by_depth)
+
+    # ── subscribers ──────────────────────────────────────────────────────────
+    def subscribe(self, fn):
+        self._subscribers.append(fn)
+        return fn
+
+    def unsubscribe(self, fn):
+        if fn in self._subscribers:
+            self._subscribers.remove(fn)
+
+    def publish(self):
+        for fn in list(self._subscribers):
+            fn(self)
+
+    # ── called by the engines ────────────────────────────────────────────────
+    def reserve(self, depth):
+        """Make nodes_by_depth[depth] valid so engines can index it blindly."""
+        short = depth + 1 - len(self.nodes_by_depth)
+        if short > 0:
+            self.nodes_by_depth.extend([0] * short)
+
+    def begin_iteration(self, bound, nodes=None):
+        if bound != float("inf"):
+            self.reserve(int(bound) + 1)
+        self._started = time.perf_counter()
+        self._start_nodes = self.nodes if nodes is None else nodes
+
+    def end_iteration(self, bound, nodes=None):
+        nodes = self.nodes if nodes is None else nodes
+        self.iterations.append({
+            "bound":   bound,
+            "nodes":   nodes - self._start_nodes,
+            "seconds": round(time.perf_counter() - self._started, 6),
+        })
+        self.publish()
+
+    # ── reading ──────────────────────────────────────────────────────────────
+    def snapshot(self):
+        """Plain-dict copy, safe to hand to another thread or json.dump."""
+        return {
+            "nodes":           self.nodes,
+            "nodes_by_depth":  list(self.nodes_by_depth),
+            "heuristic_calls": self.heuristic_calls,
+            "pruned":          self.pruned,
+            "tt_hits":         self.tt_hits,
+            "iterations":      [dict(it) for it in self.iterations],
+        }
@@ -0,0 +1,246 @@
+"""
+Additive disjoint pattern databases.
+
+Each group of tiles gets a byte table indexed by the partial-permutation
+rank of the group's positions; the entry is the number of moves of the
+group's own tiles needed to bring them home, so values of disjoint
+groups add up to an admissible estimate.
+
+Tables are built offline by a breadth-first search over (pattern, blank
+region) states and saved to one versioned file next to this module:
+
+    python patterndb.py 4 555
+    python patterndb.py 4 663
+
+The "pdb" heuristic uses whichever partition has been built, preferring
+DEFAULT_PARTITION; "pdb:663" asks for one by label.
+
+Only 4x4 is supported.  A useful 5x5 partition (four groups of six tiles)
+needs 127.5M entries per group, and this builder keeps each BFS level as
+Python tuples, which cannot hold billions of (pattern, region) states.
+
+At run time load_pdb() maps that file read-only and reads straight from
+the mapping, so startup costs one mmap() no matter how big the tables are.
+"""
+import os
+import struct
+import sys
+
+from ranking import rank_partial, table_size
+from tablefile import MappedTable, map_table, write_table
+
+VERSION = 1
+MAGIC   = b"SPDB"
+HEADER  = "<4sHBB"
+HERE    = os.path.dirname(os.path.abspath(__file__))
+
+UNSEEN  = 255
+
+# Tile groups for the standard goal (1..N-1 in order, blank last)
+PARTITIONS = {
+    4: {
+        "555":  ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+        "663":  ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    },
+}
+DEFAULT_PARTITION = {4: "555"}
+
+
+def pdb_path(size, label):
+    return os.path.join(HERE, f"puzzle_{size}x{size}_{label}.v{VERSION}.pdb")
+
+
+# ─────────────────────────────────────────────
+# BUILDING
+# ─────────────────────────────────────────────
+
+def _neighbour_masks(size):
+    masks = []
+    for e in range(size * size):
+        r, c = divmod(e, size)
+        m = 0
+        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
+            nr, nc = r+dr, c+dc
+            if 0 <= nr < size and 0 <= nc < size:
+                m |= 1 << (nr * size + nc)
+        masks.append(m)
+    return masks
+
+
+def _region(start, occupied, masks):
+    """Bitmask of the cells the blank can reach from start without
+    disturbing any pattern tile."""
+    region = frontier = 1 << start
+    while frontier:
+        grow = 0
+        while frontier:
+            low = frontier & -frontier
+            grow |= masks[low.bit_length() - 1]
+            frontier ^= low
+        frontier = grow & ~occupied & ~region
+        region |= frontier
+    return region
+
+
+def build_table(goal, size, group):
+    """
+    Breadth-first search backwards from the goal.  Blank moves through
+    non-pattern cells are free, so a state is (pattern positions, blank
+    region) and only moves of a pattern tile cost one.
+    """
+    n      = size * size
+    masks  = _neighbour_masks(size)
+    table  = bytearray([UNSEEN]) * table_size(n, len(group))
+    seen   = bytearray((len(table) * n + 7) // 8)
+
+    start  = tuple(goal.index(t) for t in group)
+    occ    = sum(1 << p for p in start)
+    region = _region(goal.index(0), occ, masks)
+    level  = [(start, region)]
+    key    = rank_partial(start, n) * n + (region & -region).bit_length() - 1
+    seen[key >> 3] |= 1 << (key & 7)
+    depth  = 0
+
+    while level:
+        nxt = []
+        for positions, region in level:
+            r = rank_partial(positions, n)
+            if table[r] == UNSEEN:
+                table[r] = depth
+            occ = sum(1 << p for p in positions)
+            for j, p in enumerate(positions):
+                targets = masks[p] & region
+                while targets:
+                    low = targets & -targets
+                    targets ^= low
+                    b = low.bit_length() - 1
+                    moved = positions[:j] + (b,) + positions[j+1:]
+                    new_occ = occ ^ (1 << p) ^ low
+                    new_region = _region(p, new_occ, masks)
+                    key = (rank_partial(moved, n) * n
+                           + (new_region & -new_region).bit_length() - 1)
+                    if seen[key >> 3] & (1 << (key & 7)):
+                        continue
+                    seen[key >> 3] |= 1 << (key & 7)
+                    nxt.append((moved, new_region))
+        level = nxt
+        depth += 1
+    return table
+
+
+# ─────────────────────────────────────────────
+# FILE FORMAT
+# ─────────────────────────────────────────────
+#   magic 4s | version H | size B | groups B
+#   goal: n bytes
+#   per group: k B, then k tile bytes
+#   tables, back to back, in group order
+
+def save_pdb(path, goal, size, groups, tables):
+    chunks = []
+    for g in groups:
+        chunks.append(struct.pack("<B", len(g)))
+        chunks.append(bytes(g))
+    write_table(path, HEADER, MAGIC, VERSION, size, (len(groups),), goal,
+                chunks + list(tables))
+
+
+# ─────────────────────────────────────────────
+# HEURISTIC
+# ─────────────────────────────────────────────
+
+class PatternDatabase(MappedTable):
+    name = "pdb"
+
+    def __init__(self, goal, size, groups, tables, _mmap=None, path=None):
+        super().__init__(_mmap, path)
+        self.goal   = tuple(goal)
+        self.size   = size
+        self.groups = groups
+        self.tables = tables
+        self.group_of = [None] * (size * size)
+        self.slot_of  = [None] * (size * size)
+        for g, tiles in enumerate(groups):
+            for j, t in enumerate(tiles):
+                self.group_of[t] = g
+                self.slot_of[t]  = j
+
+    def _value(self, g, where):
+        return self.tables[g][rank_partial([where[t] for t in self.groups[g]],
+                                           self.size * self.size)]
+
+    def h(self, board):
+        where = [0] * len(board)
+        for i, v in enumerate(board):
+            where[v] = i
+        return sum(self._value(g, where) for g in range(len(self.groups)))
+
+    def update(self, board, h, tile, frm, to):
+        # only the moved tile's group changes; find just its k tiles
+        g = self.group_of[tile]
+        if g is None:
+            return h
+        n     = self.size * self.size
+        table = self.tables[g]
+        positions = [board.index(t) for t in self.groups[g]]
+        new = table[rank_partial(positions, n)]
+        positions[self.slot_of[tile]] = frm
+        return h - table[rank_partial(positions, n)] + new
+
+
+def build_pdb(goal, size, label=None):
+    label  = label or DEFAULT_PARTITION[size]
+    groups = PARTITIONS[size][label]
+    tables = [build_table(tuple(goal), size, g) for g in groups]
+    save_pdb(pdb_path(size, label), goal, size, groups, tables)
+    return PatternDatabase(goal, size, groups, tables)
+
+
+def load_pdb(goal, size, label=None):
+    """
+    Memory-map a previously built database, or None if there is none.
+    Without a label, the first partition of this size that has been
+    built, starting with DEFAULT_PARTITION.
+    """
+    if label is None:
+        default = DEFAULT_PARTITION.get(size)
+        labels  = sorted(PARTITIONS.get(size, ()), key=lambda l: l != default)
+        for label in labels:
+            db = load_pdb(goal, size, label)
+            if db is not None:
+                return db
+        return None
+    if label not in PARTITIONS.get(size, ()):
+        raise ValueError(f"no {size}x{size} partition {label!r}")
+    path   = pdb_path(size, label)
+    mapped = map_table(path, HEADER, MAGIC, VERSION, size, goal,
+                       "pattern database")
+    if mapped is None:
+        return None
+    mm, (count,), off = mapped
+    groups = []
+    for _ in range(count):
+        k = mm[off]; off += 1
+        groups.append(tuple(mm[off:off + k])); off += k
+    groups = tuple(groups)
+    view   = memoryview(mm)
+    tables = []
+    for g in groups:
+        length = table_size(size * size, len(g))
+        tables.append(view[off:off + length])
+        off += length
+    return PatternDatabase(goal, size, groups, tables, _mmap=mm, path=path)
+
+
+if __name__ == "__main__":
+    size  = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    if size not in PARTITIONS:
+        sys.exit(f"pattern databases are only supported for "
+                 f"{', '.join(f'{s}x{s}' for s in PARTITIONS)}")
+    label = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PARTITION[size]
+    if label not in PARTITIONS[size]:
+        sys.exit(f"unknown partition {label!r}; choose from "
+                 f"{', '.join(PARTITIONS[size])}")
+    goal  = tuple(list(range(1, size * size)) + [0])
+    build_pdb(goal, size, label)
+    print(f"wrote {pdb_path(size, label)}")
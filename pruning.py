@@ -0,0 +1,110 @@
+"""
+Move-pruning automaton for the depth-first solvers.
+
+Two different sequences of blank moves often reach the same board: a
+move followed by its reverse does nothing, and going half way round a
+2x2 block one way (six moves) lands on the same board as going half way
+round the other way.  A search that tries both does the work twice.
+
+The automaton reads blank directions one at a time and rejects a move
+that would end a sequence known to be redundant.  Redundant sequences
+are found once by brute force: every direction string up to MAX_LEN is
+played on an open board, strings are grouped by the board they produce,
+and every string other than the shortest, lexicographically smallest one
+of its group is forbidden.  The smallest path to any board never
+contains a forbidden string, so at least one optimal path survives.
+
+    table, start = pruning_automaton()
+    nxt = table[state * 4 + direction]     # -1: prune this move
+
+directions(size)[blank] pairs each cell in move_table(size)[blank] with
+the direction the blank travels to reach it.
+"""
+from functools import lru_cache
+from itertools import product
+
+from board import move_table
+
+UP, DOWN, LEFT, RIGHT = range(4)
+STEPS   = ((-1, 0), (1, 0), (0, -1), (0, 1))
+MAX_LEN = 6
+PRUNED  = -1
+
+
+@lru_cache(maxsize=None)
+def directions(size):
+    out = []
+    for e, cells in enumerate(move_table(size)):
+        r, c = divmod(e, size)
+        pairs = []
+        for idx in cells:
+            step = (idx // size - r, idx % size - c)
+            pairs.append((STEPS.index(step), idx))
+        out.append(tuple(pairs))
+    return tuple(out)
+
+
+def _play(seq):
+    """Board reached by seq from an open board, plus the cells it used."""
+    # tiles are named by their starting cell; the blank starts at the
+    # origin and is named None
+    home  = lambda cell: None if cell == (0, 0) else cell
+    r = c = 0
+    board = {}              # cell -> tile, for every cell touched
+    cells = {(0, 0)}
+    for d in seq:
+        dr, dc = STEPS[d]
+        nr, nc = r + dr, c + dc
+        board[(r, c)] = board.get((nr, nc), (nr, nc))
+        board[(nr, nc)] = None
+        r, c = nr, nc
+        cells.add((r, c))
+    moved = frozenset((k, v) for k, v in board.items() if v != home(k))
+    return moved, frozenset(cells)
+
+
+def _forbidden(max_len):
+    """
+    Minimal redundant direction strings.  A string is only forbidden when
+    the string that replaces it stays inside the cells it used, so the
+    replacement is legal wherever the forbidden one is.
+    """
+    best = {}
+    redundant = set()
+    for n in range(max_len + 1):
+        for seq in product(range(4), repeat=n):     # shortlex order
+            board, cells = _play(seq)
+            keep = best.get(board)
+            if keep is None:
+                best[board] = (seq, cells)
+            elif keep[1] <= cells:
+                redundant.add(seq)
+    return {s for s in redundant
+            if not any(s[i:j] in redundant
+                       for i in range(len(s)) for j in range(i + 1, len(s) + 1)
+                       if (i, j) != (0, len(s)))}
+
+
+@lru_cache(maxsize=None)
+def pruning_automaton(max_len=MAX_LEN):
+    """
+    Flat transition table over the last max_len - 1 directions and the
+    id of the start state.  table[state * 4 + d] is the next state, or
+    PRUNED when direction d would complete a forbidden string.
+    """
+    forbidden = _forbidden(max_len)
+    ids   = {(): 0}
+    order = [()]
+    table = []
+    for hist in order:              # grows as new histories are reached
+        for d in range(4):
+            seq = hist + (d,)
+            if any(seq[i:] in forbidden for i in range(len(seq))):
+                table.append(PRUNED)
+                continue
+            nxt = seq[-(max_len - 1):] if max_len > 1 else ()
+            if nxt not in ids:
+                ids[nxt] = len(order)
+                order.append(nxt)
+            table.append(ids[nxt])
+    return tuple(table), 0
@@ -0,0 +1,80 @@
+"""
+Dense integer indices for boards and tile patterns.
+
+rank_partial(seq, n) numbers the ordered selections of len(seq) distinct
+values out of range(n) in lexicographic order, from 0 to n!/(n-k)! - 1;
+with k = n it is the rank of a whole permutation.  Each step subtracts
+the number of smaller values already used, counted with one popcount on
+a bitmask, so a rank is O(k) instead of the usual O(k^2).
+
+rank_solvable(board) ranks where the blank and tiles 1 .. n-3 are and
+leaves out the two highest tiles: swapping those two flips the parity
+without moving the blank, so exactly one of their two placements is
+solvable and the solvable boards of a size are numbered 0 .. n!/2 - 1
+with no gaps.
+
+Indices are plain ints, so bytearrays, bitsets and memory-mapped files
+can be indexed with them directly instead of hashing boards.
+"""
+from board import is_solvable
+
+
+def table_size(n, k):
+    """Number of ordered selections of k values out of n: n!/(n-k)!."""
+    out = 1
+    for i in range(k):
+        out *= n - i
+    return out
+
+
+def rank_partial(seq, n):
+    """Lexicographic rank of k distinct values out of range(n)."""
+    idx  = 0
+    used = 0
+    for i, v in enumerate(seq):
+        below = used & ((1 << v) - 1)
+        idx = idx * (n - i) + v - below.bit_count()
+        used |= 1 << v
+    return idx
+
+
+def unrank_partial(idx, n, k):
+    """Inverse of rank_partial: the k values with rank idx."""
+    digits = []
+    for i in range(k - 1, -1, -1):
+        idx, d = divmod(idx, n - i)
+        digits.append(d)
+    free = list(range(n))
+    return [free.pop(d) for d in reversed(digits)]
+
+
+def rank(perm):
+    """Lexicographic rank of a permutation of range(len(perm))."""
+    return rank_partial(perm, len(perm))
+
+
+def unrank(idx, n):
+    return unrank_partial(idx, n, n)
+
+
+def rank_solvable(board):
+    """Index of a solvable board among all solvable boards of its size."""
+    n = len(board)
+    where = [0] * n
+    for i, v in enumerate(board):
+        where[v] = i
+    return rank_partial(where[:n - 2], n)
+
+
+def unrank_solvable(idx, size, goal=None):
+    """The solvable board with index idx (inverse of rank_solvable)."""
+    n = size * size
+    board = [0] * n
+    where = unrank_partial(idx, n, n - 2)
+    for v, i in enumerate(where):
+        board[i] = v
+    a, b = sorted(set(range(n)) - set(where))
+    board[a], board[b] = n - 2, n - 1
+    if not is_solvable(board, size, goal):
+        board[a], board[b] = n - 1, n - 2
+    return board
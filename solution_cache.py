@@ -0,0 +1,111 @@
+"""
+Solved positions, remembered across turns and sessions.
+
+An entry maps a board to its optimal distance from the goal and the next
+move on an optimal path.  Storing one optimal solution stores every
+position along it, since each suffix of an optimal path is optimal too,
+so a game that follows the plan or comes back to a position later gets
+the rest of the answer without searching.
+
+Lookups try an in-memory LRU first and then a sqlite file next to this
+module.  Boards are keyed by board.pack() as bytes; all entries are for
+the standard goal (1..N-1, blank last).  If the file cannot be opened or
+written the cache keeps working from memory alone.
+"""
+import os
+import sqlite3
+from collections import OrderedDict
+
+from board import apply_move, cell_bits, pack
+
+HERE         = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, "solutions.sqlite3")
+NO_MOVE      = -1            # stored as the next move of the goal itself
+
+
+class SolutionCache:
+    def __init__(self, path=DEFAULT_PATH, capacity=100_000):
+        self.capacity = capacity
+        self.memory   = OrderedDict()       # (size, key) -> (distance, move)
+        self.db       = None
+        if path is not None:
+            try:
+                self.db = sqlite3.connect(path)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS solutions ("
+                    " size INTEGER, state BLOB, distance INTEGER,"
+                    " move INTEGER, PRIMARY KEY (size, state)"
+                    ") WITHOUT ROWID")
+            except sqlite3.Error:
+                self.db = None
+
+    @staticmethod
+    def _key(board, size):
+        nbytes = (cell_bits(size) * size * size + 7) // 8
+        return pack(board, size).to_bytes(nbytes, "little")
+
+    def _remember(self, mkey, entry):
+        memory = self.memory
+        memory[mkey] = entry
+        memory.move_to_end(mkey)
+        if len(memory) > self.capacity:
+            memory.popitem(last=False)
+
+    def get(self, board, size):
+        """(distance, next move) for board, or None if it is not known."""
+        key  = self._key(board, size)
+        mkey = (size, key)
+        entry = self.memory.get(mkey)
+        if entry is not None:
+            self.memory.move_to_end(mkey)
+            return entry
+        if self.db is None:
+            return None
+        row = self.db.execute(
+            "SELECT distance, move FROM solutions WHERE size = ? AND state = ?",
+            (size, key)).fetchone()
+        if row is None:
+            return None
+        entry = (row[0], row[1])
+        self._remember(mkey, entry)
+        return entry
+
+    def solution(self, board, size):
+        """The cached optimal moves from board to the goal, or None."""
+        entry = self.get(board, size)
+        if entry is None:
+            return None
+        moves = []
+        b = tuple(board)
+        for _ in range(entry[0]):
+            entry = self.get(b, size)
+            if entry is None or entry[1] == NO_MOVE:
+                return None
+            moves.append(entry[1])
+            b = apply_move(b, entry[1])
+        entry = self.get(b, size)
+        return moves if entry is not None and entry[0] == 0 else None
+
+    def put_path(self, board, size, moves):
+        """Store an optimal solution and every position along it."""
+        rows = []
+        b = tuple(board)
+        for i, idx in enumerate(moves):
+            rows.append((size, self._key(b, size), len(moves) - i, idx))
+            b = apply_move(b, idx)
+        rows.append((size, self._key(b, size), 0, NO_MOVE))
+        for size_, key, distance, move in rows:
+            self._remember((size_, key), (distance, move))
+        if self.db is not None:
+            try:
+                with self.db:
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                        rows)
+            except sqlite3.Error:
+                self.db = None
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,119 @@
+"""
+Background solving for the Tk games.
+
+A SolveService runs one search at a time on a worker thread.  The worker
+never touches Tk: it puts messages on a queue, and the service drains
+that queue from the event loop with root.after(), calling back into the
+game on the Tk thread.
+"""
+import queue
+import threading
+import time
+
+from metrics import SearchMetrics
+from solver import SearchCancelled
+
+
+class SolveService:
+    POLL_MS = 50
+
+    def __init__(self, root):
+        self.root    = root
+        self._queue  = queue.Queue()
+        self._job    = 0
+        self._cancel = None
+        self._callbacks = None
+        self._polling   = False
+
+    @property
+    def busy(self):
+        return self._callbacks is not None
+
+    def start(self, solve, *args, on_done, on_progress=None,
+              on_cancel=None, on_metrics=None, on_error=None, **kwargs):
+        """
+        Run solve(*args, progress=..., cancel=..., **kwargs) in the
+        background.  on_progress(nodes, bound, elapsed) and on_done(result)
+        are called on the Tk thread.  A running job is cancelled first.
+        With on_metrics, solve also gets metrics=SearchMetrics() and
+        on_metrics(snapshot) is called on the Tk thread as it publishes.
+        If solve raises, on_error(exc) is called instead of on_done;
+        without on_error the exception goes to Tk's error reporting.
+        """
+        self.cancel()
+        self._job += 1
+        job = self._job
+        self._cancel    = threading.Event()
+        self._callbacks = (on_done, on_progress, on_cancel, on_metrics,
+                           on_error)
+        started = time.perf_counter()
+        post    = self._queue.put
+        cancel  = self._cancel
+
+        def progress(nodes, bound):
+            post((job, "progress",
+                  (nodes, bound, time.perf_counter() - started)))
+
+        if on_metrics is not None:
+            metrics = SearchMetrics()
+            metrics.subscribe(
+                lambda m: post((job, "metrics", m.snapshot())))
+            kwargs["metrics"] = metrics
+
+        def work():
+            try:
+                result = solve(*args, progress=progress, cancel=cancel,
+                               **kwargs)
+            except SearchCancelled:
+                post((job, "cancelled", None))
+            except Exception as exc:
+                post((job, "error", exc))
+            else:
+                post((job, "done", result))
+
+        threading.Thread(target=work, daemon=True).start()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+        if self._callbacks is not None:
+            on_cancel = self._callbacks[2]
+            self._callbacks = None
+            if on_cancel:
+                on_cancel()
+
+    def _poll(self):
+        while True:
+            try:
+                job, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            # drop anything left over from a cancelled or replaced job
+            if job != self._job or self._callbacks is None:
+                continue
+            on_done, on_progress, _, on_metrics, on_error = self._callbacks
+            if kind == "progress":
+                if on_progress:
+                    on_progress(*payload)
+            elif kind == "metrics":
+                on_metrics(payload)
+            elif kind == "done":
+                self._callbacks = None
+                on_done(payload)
+            elif kind == "error":
+                # never raise here: the poll loop must keep running
+                self._callbacks = None
+                if on_error:
+                    on_error(payload)
+                else:
+                    self.root.report_callback_exception(
+                        type(payload), payload, payload.__traceback__)
+            elif kind == "cancelled":
+                self._callbacks = None
+        if self.busy:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,617 @@
+"""
+Search engines for the sliding puzzle.
+
+Moves are reported as board indices: the index of the tile that slides
+into the blank (the same index a player clicks on).
+"""
+import multiprocessing as mp
+import os
+import threading
+
+from board import cell_bits, is_solvable, move_table, pack, packed_move
+from endgame import get_endgame
+from heuristics import get_heuristic
+from metrics import SearchMetrics
+from pruning import STEPS, directions, pruning_automaton
+
+FOUND = -1
+INF   = float("inf")
+
+CHECK_EVERY = 0x3FFF    # nodes between progress / cancel checks, minus one
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+# ─────────────────────────────────────────────
+# IDA*
+# ─────────────────────────────────────────────
+
+def _resolve(heuristic, goal, size):
+    if isinstance(heuristic, str) or heuristic is None:
+        return get_heuristic(heuristic, goal, size)
+    return heuristic
+
+
+def _resolve_endgame(endgame, goal, size):
+    if endgame == "auto":
+        return get_endgame(tuple(goal), size)
+    return endgame
+
+
+def _bounded_dfs(b, size, heuristic, path, check=None, metrics=None,
+                 endgame=None):
+    """
+    Cost-bounded DFS over the mutable board b.  Returns (dfs, nodes):
+    dfs(blank, g, h, bound, state) gives FOUND (path then holds the moves)
+    or the smallest f that exceeded bound; nodes() counts expansions.
+    state is the pruning automaton state of the path so far.
+    check(nodes, bound), if given, runs every CHECK_EVERY + 1 nodes.
+    metrics, a metrics.SearchMetrics, counts nodes per depth and pruned
+    children; the caller brackets iterations with begin/end_iteration.
+    With an endgame.EndgameTable, a node whose h is within the table's
+    depth is looked up: a hit gives the exact rest of the path, and a miss
+    proves the node is more than depth moves from the goal.
+    """
+    dirs   = directions(size)
+    table  = pruning_automaton()[0]
+    update = heuristic.update
+    nodes  = 0
+    by_depth = None if metrics is None else metrics.nodes_by_depth
+    reach    = -1 if endgame is None else endgame.depth
+    if endgame is not None:
+        # every path to the goal has the parity of the blank's distance
+        gr, gc   = divmod(endgame.goal.index(0), size)
+        beyond   = [reach + 1 + ((reach + 1 + abs(p // size - gr)
+                                  + abs(p % size - gc)) & 1)
+                    for p in range(size * size)]
+
+    def dfs(blank, g, h, bound, state):
+        nonlocal nodes
+        nodes += 1
+        if check is not None and not nodes & CHECK_EVERY:
+            check(nodes, bound)
+        if by_depth is not None:
+            by_depth[g] += 1
+            metrics.heuristic_calls += 1
+            if not nodes % metrics.every:
+                metrics.publish()
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return FOUND
+        if h <= reach:
+            rest = endgame.distance(b)
+            if rest is None:
+                rest = beyond[blank]
+                if g + rest > bound:
+                    return g + rest
+            elif g + rest > bound:
+                return g + rest
+            else:
+                path.extend(endgame.solution(b))
+                return FOUND
+        minimum = INF
+        row = state << 2
+        for d, nxt in dirs[blank]:
+            child = table[row + d]
+            if child < 0:
+                if by_depth is not None:
+                    metrics.pruned += 1
+                continue
+            tile = b[nxt]
+            b[blank], b[nxt] = tile, 0
+            path.append(nxt)
+            t = dfs(nxt, g + 1, update(b, h, tile, nxt, blank), bound, child)
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            b[blank], b[nxt] = 0, tile
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    return dfs, lambda: nodes
+
+
+def _watcher(progress, cancel):
+    if progress is None and cancel is None:
+        return None
+
+    def check(nodes, bound):
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled()
+        if progress is not None:
+            progress(nodes, bound)
+    return check
+
+
+def ida_star(board, goal, size, heuristic="auto", progress=None, cancel=None,
+             stats=None, metrics=None, endgame="auto"):
+    """
+    Optimal solution from board to goal as a list of moves.
+
+    Works on a single mutable copy of the board: every child is made by
+    swapping the blank in place and undone on return, and the heuristic
+    is updated incrementally for the one tile that slid.  Moves are
+    filtered through pruning.pruning_automaton, so no child undoes its
+    parent's move.  Memory is bounded by the current path.
+
+    heuristic is a name understood by heuristics.get_heuristic or any
+    object with h() and update().
+
+    progress(nodes, bound) is called at the start of every iteration and
+    every CHECK_EVERY + 1 nodes; if the threading.Event cancel gets set the
+    search raises SearchCancelled at the next check.  If a stats dict is
+    given, the node count and final bound are written to it; a
+    metrics.SearchMetrics gets the per-depth and per-iteration detail.
+
+    endgame is an endgame.EndgameTable, None, or "auto" for the table
+    built for this board if there is one; the search stops as soon as it
+    reaches a board in the table.  Returns None for an unsolvable board.
+    """
+    goal      = tuple(goal)
+    if not is_solvable(board, size, goal):
+        return None
+    b         = list(board)
+    heuristic = _resolve(heuristic, goal, size)
+    path      = []
+    check     = _watcher(progress, cancel)
+    endgame   = _resolve_endgame(endgame, goal, size)
+    dfs, nodes = _bounded_dfs(b, size, heuristic, path, check, metrics,
+                              endgame)
+    start = pruning_automaton()[1]
+
+    blank = b.index(0)
+    h     = heuristic.h(b)
+    bound = h
+    while True:
+        if check:
+            check(nodes(), bound)
+        if metrics is not None:
+            metrics.begin_iteration(bound)
+        t = dfs(blank, 0, h, bound, start)
+        if metrics is not None:
+            metrics.end_iteration(bound)
+        if t == FOUND or t == INF:
+            if stats is not None:
+                stats["nodes"] = nodes()
+                stats["bound"] = bound
+            return path if t == FOUND else None
+        bound = t
+
+
+# ─────────────────────────────────────────────
+# PARALLEL IDA*
+# ─────────────────────────────────────────────
+
+POLL_SECONDS = 0.1      # how often the parent looks at cancel while waiting
+
+_pool_heuristic = None
+_pool_endgame   = None
+_pool_stop      = None
+
+
+def _init_pool(heuristic, goal, size, endgame="auto", stop=None):
+    global _pool_heuristic, _pool_endgame, _pool_stop
+    _pool_heuristic = _resolve(heuristic, goal, size)
+    _pool_endgame   = _resolve_endgame(endgame, goal, size)
+    _pool_stop      = stop
+
+
+def _stop_check(nodes, bound):
+    if _pool_stop.is_set():
+        raise SearchCancelled()
+
+
+def _search_subtree(item):
+    """
+    Worker: one bounded DFS below a frontier node.  Returns (i, path, t,
+    nodes, counts), where counts is (nodes_by_depth, pruned,
+    heuristic_calls) if the parent asked for metrics, else None.
+    """
+    i, (board, blank, g, h, state, bound, size, counting) = item
+    b    = list(board)
+    path = []
+    check = None if _pool_stop is None else _stop_check
+    metrics = None
+    if counting:
+        metrics = SearchMetrics()
+        metrics.reserve(bound + 1)
+    dfs, nodes = _bounded_dfs(b, size, _pool_heuristic, path, check,
+                              metrics, _pool_endgame)
+    try:
+        t = dfs(blank, g, h, bound, state)
+    except SearchCancelled:
+        return i, None, INF, nodes(), None
+    counts = None if metrics is None else (
+        metrics.nodes_by_depth, metrics.pruned, metrics.heuristic_calls)
+    return i, (path if t == FOUND else None), t, nodes(), counts
+
+
+def _split(board, size, heuristic, target):
+    """
+    Expand the top of the tree breadth-first, through the pruning
+    automaton, until there are at least target nodes.  Returns (moves,
+    nodes, depth, widths) where moves is a shortest solution if one
+    turned up on the way, nodes are (board, blank, h, state, moves) at
+    the final depth, and widths[d] is the number of nodes expanded at
+    depth d.
+    """
+    dirs   = directions(size)
+    table, start = pruning_automaton()
+    b      = tuple(board)
+    level  = [(b, b.index(0), heuristic.h(b), start, ())]
+    depth  = 0
+    widths = []
+    while len(level) < target:
+        nxt = []
+        widths.append(len(level))
+        for cells, blank, h, state, moves in level:
+            for d, idx in dirs[blank]:
+                child = table[(state << 2) + d]
+                if child < 0:
+                    continue
+                c = list(cells)
+                tile = c[idx]
+                c[blank], c[idx] = tile, 0
+                nh = heuristic.update(c, h, tile, idx, blank)
+                if nh == 0:
+                    return moves + (idx,), [], depth + 1, widths
+                nxt.append((tuple(c), idx, nh, child, moves + (idx,)))
+        level = nxt
+        depth += 1
+    return None, level, depth, widths
+
+
+def parallel_ida_star(board, goal, size, heuristic="auto", jobs=None,
+                      split=8, progress=None, cancel=None, stats=None,
+                      metrics=None, endgame="auto"):
+    """
+    IDA* with every threshold iteration spread over a process pool.
+
+    The top of the tree is expanded once, breadth-first, into about
+    jobs * split subtrees.  Each iteration hands every subtree that fits
+    under the bound to the pool; the first solution returned is optimal
+    because no shorter one exists below the previous bound, and the pool
+    is terminated at once.  heuristic must be a name so workers can look
+    it up, and endgame is "auto" or None for the same reason.  With
+    metrics, workers count nodes per depth too and the parent adds their
+    counts to its own, along with the nodes expanded by the split.
+
+    Setting cancel stops the workers within CHECK_EVERY nodes and the pool
+    is torn down before SearchCancelled is raised.
+
+    Called from the main thread, workers are forked and inherit the
+    parent's tables.  Forking a process that runs other threads (a Tk
+    game solving on a SolveService thread) can deadlock the child on a
+    lock some other thread held, so from any other thread the pool is
+    started with forkserver (or spawn) and each worker maps the tables
+    itself.  Returns None for an unsolvable board, before any pool is
+    started.
+    """
+    goal = tuple(goal)
+    if not is_solvable(board, size, goal):
+        return None
+    jobs = jobs or os.cpu_count() or 1
+    root = _resolve(heuristic, goal, size)
+    if root.h(board) == 0:
+        return []
+
+    found, frontier, depth, widths = _split(board, size, root, jobs * split)
+    nodes = sum(widths)
+    if metrics is not None:
+        metrics.reserve(len(widths))
+        for d, w in enumerate(widths):
+            metrics.nodes_by_depth[d] += w
+        metrics.heuristic_calls += nodes
+    if found is not None:
+        if stats is not None:
+            stats["nodes"] = nodes
+            stats["bound"] = depth
+        return list(found)
+
+    ctx   = mp.get_context(_start_method())
+    stop  = ctx.Event()
+    pool  = ctx.Pool(jobs, _init_pool, (heuristic, goal, size, endgame, stop))
+    bound = max(root.h(board), min(depth + h for _, _, h, _, _ in frontier))
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            if progress is not None:
+                progress(nodes, bound)
+            if metrics is not None:
+                metrics.begin_iteration(bound, nodes)
+            tasks, moves_of, next_bound = [], [], INF
+            for cells, blank, h, state, moves in frontier:
+                if depth + h > bound:
+                    next_bound = min(next_bound, depth + h)
+                    continue
+                tasks.append((cells, blank, depth, h, state, bound, size,
+                              metrics is not None))
+                moves_of.append(moves)
+            results = pool.imap_unordered(_search_subtree,
+                                          list(enumerate(tasks)))
+            for _ in range(len(tasks)):
+                while True:
+                    try:
+                        i, path, t, n, counts = results.next(POLL_SECONDS)
+                        break
+                    except mp.TimeoutError:
+                        if cancel is not None and cancel.is_set():
+                            raise SearchCancelled()
+                nodes += n
+                if counts is not None:
+                    by_depth, pruned, calls = counts
+                    metrics.reserve(len(by_depth) - 1)
+                    for d, c in enumerate(by_depth):
+                        metrics.nodes_by_depth[d] += c
+                    metrics.pruned += pruned
+                    metrics.heuristic_calls += calls
+                if path is not None:
+                    if metrics is not None:
+                        metrics.end_iteration(bound, nodes)
+                    if stats is not None:
+                        stats["nodes"] = nodes
+                        stats["bound"] = bound
+                    return list(moves_of[i]) + path
+                if t < next_bound:
+                    next_bound = t
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled()
+            if metrics is not None:
+                metrics.end_iteration(bound, nodes)
+            if next_bound == INF:
+                return None
+            bound = next_bound
+    finally:
+        stop.set()
+        pool.terminate()
+        pool.join()
+
+
+def _start_method():
+    """fork only from the main thread; see parallel_ida_star."""
+    methods = mp.get_all_start_methods()
+    if threading.current_thread() is threading.main_thread() \
+            and "fork" in methods:
+        return "fork"
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+# ─────────────────────────────────────────────
+# A*
+# ─────────────────────────────────────────────
+
+ROOT = 4                # parent code of the start state
+
+
+def a_star(board, goal, size, heuristic="auto", max_states=1_000_000,
+           progress=None, cancel=None, stats=None, metrics=None,
+           endgame="auto"):
+    """
+    Best-first search on f = g + h with an open list of buckets indexed by
+    f: f values are small integers, so push is an append and pop takes
+    from the lowest non-empty bucket, with no heap.  Each bucket is a
+    stack, so ties go to the most recently generated (deepest) node.
+
+    Every state seen is kept as one entry, packed state -> g << 3 | code,
+    where code is the direction the blank moved to reach it (pruning.STEPS
+    order) or ROOT.  That is all the path reconstruction needs, and the
+    board itself is only unpacked when a state is expanded.  Stale open
+    entries are skipped when popped, and a state reached again more
+    cheaply is reopened, so inconsistent heuristics stay optimal.
+
+    Expands far fewer nodes than ida_star on easy boards, whose frontier
+    fits in memory; once more than max_states states are stored the search
+    hands over to ida_star, after dropping everything it stored.  Returns
+    None for an unsolvable board.  stats gets the nodes of both searches,
+    the states A* stored and the final bound.
+    progress, cancel and metrics work as for ida_star, with the
+    current f standing in for the bound; endgame is only passed on to
+    that fallback.
+    """
+    goal = tuple(goal)
+    if not is_solvable(board, size, goal):
+        return None
+    heuristic = _resolve(heuristic, goal, size)
+    update = heuristic.update
+    dirs   = directions(size)
+    deltas = [dr * size + dc for dr, dc in STEPS]
+    bits   = cell_bits(size)
+    mask   = (1 << bits) - 1
+    shifts = [i * bits for i in range(size * size)]
+    end    = pack(goal, size)
+    start  = pack(board, size)
+    blank  = list(board).index(0)
+    h      = heuristic.h(board)
+
+    seen    = {start: ROOT}
+    buckets = [[] for _ in range(h + 1)]
+    buckets[h].append((start, blank, h))
+    f = h
+    nodes = 0
+    by_depth = None if metrics is None else metrics.nodes_by_depth
+    if metrics is not None:
+        metrics.begin_iteration(h, 0)
+    while True:
+        while f < len(buckets) and not buckets[f]:
+            f += 1
+        if f == len(buckets):
+            return None
+        state, blank, h = buckets[f].pop()
+        entry = seen[state]
+        g = entry >> 3
+        if g + h != f:
+            continue                    # reached more cheaply since
+        if state == end:
+            break
+        nodes += 1
+        if not nodes & CHECK_EVERY:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            if progress is not None:
+                progress(nodes, f)
+        if by_depth is not None:
+            if g >= len(by_depth):
+                metrics.reserve(g)
+            by_depth[g] += 1
+            if not nodes % metrics.every:
+                metrics.publish()
+        if len(seen) > max_states:
+            if metrics is not None:
+                metrics.end_iteration(f, nodes)
+            states = len(seen)
+            seen = buckets = None       # free them before IDA* starts
+            inner = {}
+            moves = ida_star(board, goal, size, heuristic, progress=progress,
+                             cancel=cancel, stats=inner, metrics=metrics,
+                             endgame=endgame)
+            if stats is not None:
+                stats["nodes"]  = nodes + inner["nodes"]
+                stats["states"] = states
+                stats["bound"]  = inner["bound"]
+            return moves
+
+        b = [state >> sh & mask for sh in shifts]
+        back = (entry & 7) ^ 1          # the move that would undo ours
+        g += 1
+        for d, nxt in dirs[blank]:
+            if d == back:
+                if by_depth is not None:
+                    metrics.pruned += 1
+                continue
+            tile = b[nxt]
+            child = state + (tile << shifts[blank]) - (tile << shifts[nxt])
+            old = seen.get(child)
+            if old is not None and old >> 3 <= g:
+                continue
+            b[blank], b[nxt] = tile, 0
+            ch = update(b, h, tile, nxt, blank)
+            b[blank], b[nxt] = 0, tile
+            if by_depth is not None:
+                metrics.heuristic_calls += 1
+            seen[child] = g << 3 | d
+            cf = g + ch
+            while cf >= len(buckets):
+                buckets.append([])
+            buckets[cf].append((child, nxt, ch))
+            if cf < f:
+                f = cf                  # only with an inconsistent heuristic
+
+    if metrics is not None:
+        metrics.end_iteration(f, nodes)
+    if stats is not None:
+        stats["nodes"]  = nodes
+        stats["states"] = len(seen)
+        stats["bound"]  = f
+    moves = []
+    code  = seen[state] & 7
+    while code != ROOT:
+        moves.append(blank)
+        prev  = blank - deltas[code]
+        state = packed_move(state, blank, prev, size)
+        blank = prev
+        code  = seen[state] & 7
+    return moves[::-1]
+
+
+# ─────────────────────────────────────────────
+# BIDIRECTIONAL SEARCH
+# ─────────────────────────────────────────────
+
+def _walk(seen, state, blank, size, toward_root):
+    """
+    Follow seen from state back to its root.  toward_root gives the moves
+    that walk there; otherwise the moves that lead from the root to state,
+    last one first.
+    """
+    moves = []
+    prev = seen[state]
+    while prev >= 0:
+        moves.append(prev if toward_root else blank)
+        state = packed_move(state, blank, prev, size)
+        blank, prev = prev, seen[state]
+    return moves
+
+
+def bidirectional_search(board, goal, size, max_states=2_000_000,
+                         heuristic="auto", progress=None, cancel=None,
+                         stats=None, endgame="auto"):
+    """
+    Breadth-first from both the start and the goal, always growing the
+    smaller frontier by one full level, until the two meet.  States are
+    packed ints and each side maps state -> the blank cell it came from
+    (-1 for its root), which is all that is needed to rebuild the path.
+
+    Fast for the shallow scrambles the games deal; if the two maps grow
+    past max_states the search hands over to ida_star instead (with
+    this endgame).
+
+    progress and cancel work as for ida_star; the bound is the solution
+    length the current level looks for, the two frontier depths plus one.
+    """
+    goal = tuple(goal)
+    if not is_solvable(board, size, goal):
+        return None
+    nbrs  = move_table(size)
+    start = pack(board, size)
+    end   = pack(goal, size)
+    if start == end:
+        return []
+
+    sides = [
+        ({start: -1}, [(start, list(board).index(0))]),
+        ({end: -1},   [(end, goal.index(0))]),
+    ]
+    depth = [0, 0]
+    check = _watcher(progress, cancel)
+    nodes = 0
+    while True:
+        bound = depth[0] + depth[1] + 1
+        if check:
+            check(nodes, bound)
+        i = 0 if len(sides[0][1]) <= len(sides[1][1]) else 1
+        seen, frontier = sides[i]
+        other = sides[1 - i][0]
+        meets = []
+        nxt = []
+        for state, blank in frontier:
+            nodes += 1
+            if check is not None and not nodes & CHECK_EVERY:
+                check(nodes, bound)
+            came_from = seen[state]
+            for idx in nbrs[blank]:
+                if idx == came_from:
+                    continue
+                child = packed_move(state, blank, idx, size)
+                if child in seen:
+                    continue
+                seen[child] = blank
+                nxt.append((child, idx))
+                if child in other:
+                    meets.append((child, idx))
+        sides[i] = (seen, nxt)
+        depth[i] += 1
+
+        if meets:
+            fwd, bwd = sides[0][0], sides[1][0]
+            best = None
+            for state, blank in meets:
+                head = _walk(fwd, state, blank, size, False)[::-1]
+                tail = _walk(bwd, state, blank, size, True)
+                if best is None or len(head) + len(tail) < len(best):
+                    best = head + tail
+            if stats is not None:
+                stats["nodes"] = nodes
+                stats["states"] = len(fwd) + len(bwd)
+            return best
+        if not nxt:
+            return None
+        if len(sides[0][0]) + len(sides[1][0]) > max_states:
+            return ida_star(board, goal, size, heuristic,
+                            progress=progress, cancel=cancel, stats=stats,
+                            endgame=endgame)
@@ -0,0 +1,57 @@
+"""
+Versioned table files, shared by patterndb, endgame and distance_table.
+
+Every file starts with a struct header whose first three fields are
+magic (4s), version (H) and board size (B), followed by the table's own
+fields, then the goal the table was built for as one byte per cell.
+What comes after the goal is up to each table.
+
+Files are written to a temporary name and renamed into place, so a
+reader never sees a half-written table, and are read through a
+read-only memory map, so loading costs one mmap() whatever the size.
+"""
+import mmap
+import os
+import struct
+
+
+def write_table(path, fmt, magic, version, size, fields, goal, chunks):
+    """Write header, goal and the byte chunks of a table atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack(fmt, magic, version, size, *fields))
+        f.write(bytes(goal))
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def map_table(path, fmt, magic, version, size, goal, what="table"):
+    """
+    Map a table file read-only.  Returns (mmap, fields, offset), with the
+    header fields after size and the offset just past the goal, or None
+    if there is no file or it was built for another size or goal.  A
+    file with the wrong magic or version raises ValueError.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    fmagic, fversion, fsize, *fields = struct.unpack_from(fmt, mm, 0)
+    if fmagic != magic or fversion != version:
+        mm.close()
+        raise ValueError(f"{what} has the wrong format or version")
+    off = struct.calcsize(fmt)
+    n = fsize * fsize
+    if fsize != size or tuple(mm[off:off + n]) != tuple(goal):
+        mm.close()
+        return None
+    return mm, fields, off + n
+
+
+class MappedTable:
+    """Base for tables that may be read straight from a memory map."""
+
+    def __init__(self, _mmap=None, path=None):
+        self._mmap = _mmap           # keeps the mapping alive
+        self.path  = path            # file it was loaded from, if any
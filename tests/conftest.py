@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+
+import pytest
+
+# the modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import apply_move, make_goal, move_table, random_board  # noqa: E402
+from distance_table import DistanceTable, build_distances          # noqa: E402
+
+GOAL3 = tuple(make_goal(3))
+GOAL4 = tuple(make_goal(4))
+
+
+@pytest.fixture(scope="session")
+def exact3():
+    """The 3x3 exact distances, built in memory: ground truth for lengths."""
+    return DistanceTable(GOAL3, 3, build_distances(GOAL3, 3))
+
+
+def boards(size, count, seed, goal=None):
+    rng = random.Random(seed)
+    return [random_board(size, rng, goal) for _ in range(count)]
+
+
+def play(board, moves):
+    """The board after moves, checking that each one is legal."""
+    b = tuple(board)
+    for idx in moves:
+        assert idx in move_table(int(len(b) ** 0.5))[b.index(0)]
+        b = apply_move(b, idx)
+    return b
+
+
+def check_updates(heuristic, goal, size, seed, steps=300):
+    """Random walk checking update() against a full h() after every move."""
+    rng   = random.Random(seed)
+    nbrs  = move_table(size)
+    board = random_board(size, rng, goal)
+    blank = board.index(0)
+    h     = heuristic.h(board)
+    for _ in range(steps):
+        nxt  = rng.choice(nbrs[blank])
+        tile = board[nxt]
+        board[blank], board[nxt] = tile, 0
+        h = heuristic.update(board, h, tile, nxt, blank)
+        assert h == heuristic.h(board)
+        blank = nxt
+
+
+def swapped(goal, i=0, j=1):
+    """goal with two tiles exchanged: the other parity class."""
+    board = list(goal)
+    board[i], board[j] = board[j], board[i]
+    return board
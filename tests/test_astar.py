@@ -0,0 +1,39 @@
+import pytest
+
+from conftest import GOAL3, boards, play, swapped
+from metrics import SearchMetrics
+from solver import a_star
+
+
+@pytest.mark.parametrize("name", ["manhattan", "walking_distance"])
+def test_optimal_lengths_3x3(name, exact3):
+    for board in boards(3, 40, seed=1):
+        stats = {}
+        moves = a_star(board, GOAL3, 3, name, stats=stats)
+        assert play(board, moves) == GOAL3
+        assert len(moves) == exact3.distance(board)
+        assert stats["bound"] == len(moves)
+
+
+def test_fallback_to_ida(exact3):
+    fallbacks = 0
+    for board in boards(3, 40, seed=1):
+        stats, metrics = {}, SearchMetrics()
+        moves = a_star(board, GOAL3, 3, "manhattan", max_states=500,
+                       stats=stats, metrics=metrics, endgame=None)
+        assert play(board, moves) == GOAL3
+        assert len(moves) == exact3.distance(board)
+        assert stats["bound"] == len(moves)
+        assert stats["nodes"] == metrics.nodes
+        if len(metrics.iterations) > 1:         # IDA* took over
+            fallbacks += 1
+            assert 500 < stats["states"] <= 500 + 4
+    assert fallbacks
+
+
+def test_goal_and_unsolvable_boards():
+    assert a_star(list(GOAL3), GOAL3, 3, "manhattan") == []
+    for board in (swapped(GOAL3), swapped(GOAL3, 6, 7)):
+        assert a_star(board, GOAL3, 3, "manhattan") is None
+        assert a_star(board, GOAL3, 3, "manhattan", max_states=10,
+                      endgame=None) is None
@@ -0,0 +1,29 @@
+from bench import KORF100, SUITES, from_blank_first, suite_instances
+from board import is_solvable, make_goal
+
+
+def test_korf100_is_embedded():
+    lines = KORF100.splitlines()
+    assert len(lines) == 100
+    boards = [[int(v) for v in line.split()] for line in lines]
+    assert len({tuple(b) for b in boards}) == 100
+    for b in boards:
+        assert sorted(b) == list(range(16))
+        assert is_solvable(b, 4, tuple(range(16)))
+    size, mapped = suite_instances("korf100", 100)
+    assert size == 4 and mapped == [from_blank_first(b) for b in boards]
+    assert all(is_solvable(b, 4) for b in mapped)
+
+
+def test_from_blank_first_maps_the_goal():
+    for size in (3, 4, 5):
+        n = size * size
+        assert from_blank_first(list(range(n))) == make_goal(size)
+
+
+def test_suites_are_reproducible():
+    for name, spec in SUITES.items():
+        size, boards = suite_instances(name, 3)
+        assert size == spec["size"] and len(boards) == 3
+        assert (size, boards) == suite_instances(name, 3)
+        assert all(is_solvable(b, size) for b in boards)
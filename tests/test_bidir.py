@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from conftest import GOAL3, GOAL4, boards, play, swapped
+from solver import CHECK_EVERY, SearchCancelled, bidirectional_search
+
+
+def test_optimal_lengths_3x3(exact3):
+    for board in boards(3, 40, seed=1):
+        moves = bidirectional_search(board, GOAL3, 3)
+        assert play(board, moves) == GOAL3
+        assert len(moves) == exact3.distance(board)
+
+
+def test_unsolvable_boards():
+    assert bidirectional_search(swapped(GOAL3), GOAL3, 3) is None
+
+
+def test_progress_reports_the_bound():
+    for board in boards(3, 10, seed=13):
+        bounds = []
+        moves  = bidirectional_search(board, GOAL3, 3,
+                                      progress=lambda n, b: bounds.append(b))
+        assert bounds == sorted(bounds)
+        assert bounds[-1] == len(moves)
+
+
+def test_cancel_inside_a_level():
+    cancel = threading.Event()
+    calls  = []
+
+    def progress(nodes, bound):
+        calls.append(nodes)
+        if nodes == CHECK_EVERY + 1:            # part way through a level
+            cancel.set()
+
+    with pytest.raises(SearchCancelled):
+        bidirectional_search(boards(4, 1, seed=14)[0], GOAL4, 4,
+                             progress=progress, cancel=cancel)
+    assert calls[-1] == CHECK_EVERY + 1
@@ -0,0 +1,59 @@
+import itertools
+
+import pytest
+
+from board import (apply_move, is_solvable, move_table, random_board,
+                   random_instances)
+from conftest import GOAL4, boards, swapped
+from heuristics import get_heuristic
+from solver import a_star, bidirectional_search, ida_star
+
+
+def test_parity_matches_reachability_for_other_goal():
+    goal = (0, 1, 2, 3, 4, 5, 6, 7, 8)          # blank first
+    nbrs = move_table(3)
+    seen = {goal}
+    level = [goal]
+    while level:
+        nxt = []
+        for board in level:
+            blank = board.index(0)
+            for idx in nbrs[blank]:
+                child = apply_move(board, idx, blank)
+                if child not in seen:
+                    seen.add(child)
+                    nxt.append(child)
+        level = nxt
+    assert len(seen) == 181_440
+    for perm in itertools.permutations(range(9)):
+        assert is_solvable(perm, 3, goal) == (perm in seen)
+
+
+def test_random_boards_are_solvable():
+    goal = tuple(range(16))
+    for board in boards(4, 200, seed=16):
+        assert is_solvable(board, 4)
+        i, j = [k for k, v in enumerate(board) if v][:2]
+        assert not is_solvable(swapped(board, i, j), 4)
+    for board in boards(4, 200, seed=17, goal=goal):
+        assert is_solvable(board, 4, goal)
+    assert len({tuple(random_board(4)) for _ in range(100)}) == 100
+
+
+def test_random_instances_band():
+    h = get_heuristic("manhattan", GOAL4, 4).h
+    made = list(random_instances(4, 30, band=(30, 34), seed=18))
+    assert len(made) == 30
+    assert all(30 <= h(b) <= 34 for b in made)
+    assert made == list(random_instances(4, 30, band=(30, 34), seed=18))
+    with pytest.raises(ValueError):
+        next(random_instances(4, 1, band=(5, 4)))
+
+
+def test_engines_with_other_goal():
+    goal = tuple(range(9))
+    for board in boards(3, 10, seed=7, goal=goal):
+        lengths = {len(bidirectional_search(board, goal, 3)),
+                   len(a_star(board, goal, 3, "manhattan")),
+                   len(ida_star(board, goal, 3, "manhattan", endgame=None))}
+        assert len(lengths) == 1
@@ -0,0 +1,52 @@
+import distance_table
+from conftest import GOAL3, boards, check_updates, play, swapped
+from distance_table import load_dtb, save_dtb
+from solver import a_star, bidirectional_search, ida_star, parallel_ida_star
+
+
+def test_solutions(exact3):
+    assert exact3.distance(GOAL3) == 0
+    assert exact3.lookup(GOAL3) == (0, None)
+    assert max(exact3.dist) == 31
+    for board in boards(3, 40, seed=3):
+        moves = exact3.solution(board)
+        assert play(board, moves) == GOAL3
+        assert len(moves) == exact3.distance(board)
+        assert exact3.lookup(board) == (len(moves), moves[0])
+
+
+def test_update_matches_h(exact3):
+    check_updates(exact3, GOAL3, 3, seed=5)
+
+
+def test_unsolvable_boards(exact3):
+    # h() alone would read the solvable twin's distance
+    for board in (swapped(GOAL3), swapped(GOAL3, 6, 7)):
+        assert exact3.distance(board) is None
+        assert exact3.solution(board) is None
+        assert ida_star(board, GOAL3, 3, exact3, endgame=None) is None
+        assert a_star(board, GOAL3, 3, exact3) is None
+        assert bidirectional_search(board, GOAL3, 3,
+                                    heuristic=exact3) is None
+
+
+def test_parallel_unsolvable_with_exact_heuristic(tmp_path, monkeypatch,
+                                                  exact3):
+    # workers look the table up by name, so it has to be on disk
+    monkeypatch.setattr(distance_table, "HERE", str(tmp_path))
+    distance_table.get_distance_table.cache_clear()
+    try:
+        save_dtb(distance_table.dtb_path(3), GOAL3, 3, exact3.dist)
+        assert parallel_ida_star(swapped(GOAL3, 6, 7), GOAL3, 3, "exact",
+                                 jobs=2, endgame=None) is None
+    finally:
+        distance_table.get_distance_table.cache_clear()
+
+
+def test_file_round_trip(tmp_path, monkeypatch, exact3):
+    monkeypatch.setattr(distance_table, "HERE", str(tmp_path))
+    save_dtb(distance_table.dtb_path(3), GOAL3, 3, exact3.dist)
+    loaded = load_dtb(GOAL3, 3)
+    assert loaded.path.startswith(str(tmp_path))
+    assert bytes(loaded.dist) == bytes(exact3.dist)
+    assert load_dtb(tuple(range(9)), 3) is None     # built for another goal
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+import endgame
+from board import apply_move, move_table
+from conftest import GOAL3, GOAL4, boards, play
+from endgame import build_edb, load_edb
+from solver import ida_star
+
+DEPTH = 12
+
+
+@pytest.fixture(scope="module")
+def table4(tmp_path_factory):
+    """A shallow 4x4 table built into a scratch directory and mapped."""
+    here = endgame.HERE
+    endgame.HERE = str(tmp_path_factory.mktemp("edb"))
+    try:
+        yield build_edb(GOAL4, 4, DEPTH)
+    finally:
+        endgame.HERE = here
+
+
+def walks(goal, size, count, steps, seed):
+    rng  = random.Random(seed)
+    nbrs = move_table(size)
+    out  = []
+    for _ in range(count):
+        b, prev = tuple(goal), None
+        for _ in range(steps):
+            e = b.index(0)
+            b, prev = apply_move(b, rng.choice(
+                [i for i in nbrs[e] if i != prev]), e), e
+        out.append(list(b))
+    return out
+
+
+def test_distance_and_solution_match_ida(table4):
+    assert table4.path is not None and table4.depth == DEPTH
+    assert load_edb(GOAL4, 4, DEPTH) is not None
+    assert table4.distance(GOAL4) == 0 and table4.solution(GOAL4) == []
+    for board in walks(GOAL4, 4, 40, steps=13, seed=22):
+        optimal = len(ida_star(board, GOAL4, 4, "manhattan", endgame=None))
+        if optimal > DEPTH:
+            assert table4.distance(board) is None
+            assert table4.solution(board) is None
+            continue
+        assert table4.distance(board) == optimal
+        moves = table4.solution(board)
+        assert play(board, moves) == GOAL4 and len(moves) == optimal
+        assert table4.lookup(board) == (optimal, moves[0] if moves else None)
+
+
+def test_ida_with_endgame_stays_optimal(table4):
+    for board in walks(GOAL4, 4, 10, steps=30, seed=23):
+        plain = ida_star(board, GOAL4, 4, "manhattan", endgame=None)
+        fast  = ida_star(board, GOAL4, 4, "manhattan", endgame=table4)
+        assert play(board, fast) == GOAL4
+        assert len(fast) == len(plain)
+
+
+def test_3x3_distances(exact3):
+    keys, values = endgame.build_table(GOAL3, 3, DEPTH)
+    width = endgame.key_width(3)
+    table = endgame.EndgameTable(GOAL3, 3, DEPTH,
+                                 [k.to_bytes(width, "big") for k in keys],
+                                 values)
+    for board in boards(3, 200, seed=24):
+        d = exact3.distance(board)
+        assert table.distance(board) == (d if d <= DEPTH else None)
@@ -0,0 +1,24 @@
+import pytest
+
+from board import make_goal
+from conftest import GOAL3, boards, check_updates
+from heuristics import HEURISTICS, get_heuristic
+
+
+@pytest.mark.parametrize("name", sorted(HEURISTICS))
+@pytest.mark.parametrize("size", [3, 4])
+def test_update_matches_h(name, size):
+    goal = tuple(make_goal(size))
+    check_updates(get_heuristic(name, goal, size), goal, size, seed=size)
+
+
+@pytest.mark.parametrize("name", sorted(HEURISTICS))
+def test_admissible(name, exact3):
+    heuristic = get_heuristic(name, GOAL3, 3)
+    for board in boards(3, 200, seed=6):
+        assert heuristic.h(board) <= exact3.distance(board)
+
+
+def test_unknown_name():
+    with pytest.raises(ValueError):
+        get_heuristic("euclidean", GOAL3, 3)
@@ -0,0 +1,22 @@
+from conftest import GOAL3, boards, play, swapped
+from solver import ida_star
+
+
+def test_optimal_lengths_3x3(exact3):
+    for name in ("manhattan", "linear_conflict"):
+        for board in boards(3, 40, seed=1):
+            moves = ida_star(board, GOAL3, 3, name, endgame=None)
+            assert play(board, moves) == GOAL3
+            assert len(moves) == exact3.distance(board)
+
+
+def test_goal_needs_no_moves():
+    assert ida_star(list(GOAL3), GOAL3, 3, "manhattan") == []
+
+
+def test_unsolvable_boards():
+    for board in (swapped(GOAL3), swapped(GOAL3, 6, 7)):
+        for name in ("manhattan", "linear_conflict", "walking_distance",
+                     "auto"):
+            assert ida_star(board, GOAL3, 3, name, endgame=None) is None
+        assert ida_star(board, GOAL3, 3) is None
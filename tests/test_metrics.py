@@ -0,0 +1,25 @@
+import pytest
+
+from conftest import GOAL3, boards
+from metrics import SearchMetrics
+from solver import a_star, ida_star, parallel_ida_star
+
+
+@pytest.mark.parametrize("engine", [
+    lambda b, **kw: ida_star(b, GOAL3, 3, "manhattan", endgame=None, **kw),
+    lambda b, **kw: a_star(b, GOAL3, 3, "manhattan", **kw),
+    lambda b, **kw: parallel_ida_star(b, GOAL3, 3, "manhattan", jobs=2,
+                                      split=2, endgame=None, **kw),
+], ids=["ida", "astar", "ida-parallel"])
+def test_nodes_match_stats(engine):
+    for board in boards(3, 3, seed=19):
+        metrics, stats = SearchMetrics(), {}
+        seen = []
+        metrics.subscribe(lambda m: seen.append(m.snapshot()))
+        moves = engine(board, stats=stats, metrics=metrics)
+        snap = metrics.snapshot()
+        assert snap["nodes"] == stats["nodes"] > 0
+        assert snap["nodes_by_depth"][0] >= 1
+        assert not any(snap["nodes_by_depth"][len(moves) + 2:])
+        assert snap["iterations"][-1]["bound"] == len(moves)
+        assert seen and seen[-1] == snap
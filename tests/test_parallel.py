@@ -0,0 +1,30 @@
+import threading
+
+import pytest
+
+from conftest import GOAL3, GOAL4, boards, play, swapped
+from solver import SearchCancelled, parallel_ida_star
+
+
+def test_optimal_lengths_3x3(exact3):
+    for board in boards(3, 4, seed=2):
+        moves = parallel_ida_star(board, GOAL3, 3, "manhattan", jobs=2,
+                                  split=2, endgame=None)
+        assert play(board, moves) == GOAL3
+        assert len(moves) == exact3.distance(board)
+
+
+def test_unsolvable_boards():
+    for board in (swapped(GOAL3), swapped(GOAL3, 6, 7)):
+        assert parallel_ida_star(board, GOAL3, 3, "manhattan", jobs=2,
+                                 endgame=None) is None
+        assert parallel_ida_star(board, GOAL3, 3, jobs=2) is None
+
+
+def test_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    board  = boards(4, 1, seed=12)[0]
+    with pytest.raises(SearchCancelled):
+        parallel_ida_star(board, GOAL4, 4, "manhattan", jobs=2,
+                          cancel=cancel, endgame=None)
@@ -0,0 +1,45 @@
+import pytest
+
+import heuristics
+import patterndb
+from conftest import GOAL4, boards, check_updates
+from heuristics import get_heuristic
+from patterndb import build_pdb, load_pdb
+
+SMALL = ((1, 2, 3), (4, 5, 6), (7, 8))
+
+
+@pytest.fixture
+def small_pdb(tmp_path, monkeypatch):
+    """A cheap partition built into a scratch directory."""
+    monkeypatch.setattr(patterndb, "HERE", str(tmp_path))
+    monkeypatch.setitem(patterndb.PARTITIONS[4], "small", SMALL)
+    heuristics._pattern_db.cache_clear()
+    yield build_pdb(GOAL4, 4, "small")
+    heuristics._pattern_db.cache_clear()
+
+
+def test_update_matches_h():
+    db = load_pdb(GOAL4, 4)
+    if db is None:
+        pytest.skip("no 4x4 pattern database built")
+    check_updates(db, GOAL4, 4, seed=4)
+
+
+def test_partition_is_selectable(small_pdb):
+    db = get_heuristic("pdb:small", GOAL4, 4)
+    assert db.groups == SMALL
+    # with the default partition missing, "pdb" takes whatever is built
+    assert get_heuristic("pdb", GOAL4, 4).groups == SMALL
+    with pytest.raises(LookupError):
+        get_heuristic("pdb:663", GOAL4, 4)
+    with pytest.raises(ValueError):
+        get_heuristic("pdb:777", GOAL4, 4)
+
+
+def test_loaded_table_matches_built(small_pdb):
+    loaded = load_pdb(GOAL4, 4, "small")
+    assert loaded.path.endswith("puzzle_4x4_small.v1.pdb")
+    check_updates(loaded, GOAL4, 4, seed=10)
+    for board in boards(4, 50, seed=11):
+        assert loaded.h(board) == small_pdb.h(board)
@@ -0,0 +1,56 @@
+from board import move_table
+from conftest import GOAL3
+from pruning import STEPS, directions, pruning_automaton
+
+
+def test_directions_match_move_table():
+    for size in (3, 4, 5):
+        for blank, pairs in enumerate(directions(size)):
+            assert tuple(idx for _, idx in pairs) == move_table(size)[blank]
+            for d, idx in pairs:
+                dr, dc = STEPS[d]
+                assert idx == blank + dr * size + dc
+
+
+def test_reverse_moves_are_pruned():
+    table, start = pruning_automaton()
+    for d in range(4):
+        state = table[start * 4 + d]
+        assert table[state * 4 + (d ^ 1)] < 0
+
+
+def test_every_board_keeps_a_shortest_path():
+    # breadth-first with and without the automaton reach the same boards
+    # at the same depths
+    table, start = pruning_automaton()
+    dirs = directions(3)
+    plain = {GOAL3: 0}
+    level = [GOAL3]
+    pruned = {GOAL3: 0}
+    frontier = [(GOAL3, start)]
+    for depth in range(1, 21):
+        nxt = []
+        for b in level:
+            e = b.index(0)
+            for _, idx in dirs[e]:
+                c = list(b)
+                c[e], c[idx] = c[idx], 0
+                c = tuple(c)
+                if c not in plain:
+                    plain[c] = depth
+                    nxt.append(c)
+        level = nxt
+        grown = []
+        for b, state in frontier:
+            e = b.index(0)
+            for d, idx in dirs[e]:
+                child = table[state * 4 + d]
+                if child < 0:
+                    continue
+                c = list(b)
+                c[e], c[idx] = c[idx], 0
+                c = tuple(c)
+                pruned.setdefault(c, depth)
+                grown.append((c, child))
+        frontier = grown
+    assert pruned == plain
@@ -0,0 +1,34 @@
+import itertools
+import random
+
+from board import is_solvable
+from ranking import (rank, rank_partial, rank_solvable, table_size, unrank,
+                     unrank_partial, unrank_solvable)
+
+
+def test_rank_partial_is_lexicographic():
+    for n, k in ((5, 5), (6, 3), (7, 1)):
+        selections = list(itertools.permutations(range(n), k))
+        assert len(selections) == table_size(n, k)
+        for i, sel in enumerate(selections):
+            assert rank_partial(sel, n) == i
+            assert unrank_partial(i, n, k) == list(sel)
+
+
+def test_rank_round_trip_4x4():
+    rng = random.Random(23)
+    for _ in range(200):
+        perm = list(range(16))
+        rng.shuffle(perm)
+        assert unrank(rank(perm), 16) == perm
+
+
+def test_rank_solvable_is_a_bijection_on_3x3():
+    ranks = set()
+    for perm in itertools.permutations(range(9)):
+        board = list(perm)
+        if is_solvable(board, 3):
+            r = rank_solvable(board)
+            assert unrank_solvable(r, 3) == board
+            ranks.add(r)
+    assert ranks == set(range(181_440))
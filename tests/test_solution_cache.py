@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import GOAL3, boards, play
+from solution_cache import NO_MOVE, SolutionCache
+
+
+@pytest.fixture
+def solved(exact3):
+    return [(b, exact3.solution(b)) for b in boards(3, 5, seed=21)]
+
+
+def _check_round_trip(cache, solved):
+    for board, moves in solved:
+        cache.put_path(board, 3, moves)
+    for board, moves in solved:
+        assert cache.get(board, 3) == (len(moves), moves[0])
+        assert cache.solution(board, 3) == moves
+        # every suffix of an optimal path was stored with it
+        mid = play(board, moves[:len(moves) // 2])
+        assert cache.solution(mid, 3) == moves[len(moves) // 2:]
+    assert cache.get(GOAL3, 3) == (0, NO_MOVE)
+    assert cache.solution(GOAL3, 3) == []
+
+
+def test_memory_only(solved):
+    cache = SolutionCache(path=None)
+    _check_round_trip(cache, solved)
+    assert cache.get([1, 2, 3, 4, 5, 6, 0, 7, 8], 3) is None
+    assert cache.solution([1, 2, 3, 4, 5, 6, 0, 7, 8], 3) is None
+
+
+def test_sqlite_file(tmp_path, solved):
+    path  = str(tmp_path / "solutions.sqlite3")
+    cache = SolutionCache(path)
+    _check_round_trip(cache, solved)
+    cache.close()
+    # a new session, and one whose memory holds a single entry, read the
+    # same answers back from the file
+    for capacity in (100_000, 1):
+        again = SolutionCache(path, capacity=capacity)
+        for board, moves in solved:
+            assert again.solution(board, 3) == moves
+        assert len(again.memory) <= capacity
+        again.close()
+
+
+def test_unusable_file_falls_back_to_memory(tmp_path, solved):
+    cache = SolutionCache(str(tmp_path))            # a directory
+    assert cache.db is None
+    _check_round_trip(cache, solved)
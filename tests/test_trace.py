@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from backtrack import PureBacktrackSolver, TraceStore
+from board import move_table
+from conftest import GOAL3
+
+
+def random_walk(start, steps, seed):
+    rng  = random.Random(seed)
+    nbrs = move_table(3)
+    walk, b = [], list(start)
+    for _ in range(steps):
+        e   = b.index(0)
+        idx = rng.choice(nbrs[e])
+        b[e], b[idx] = b[idx], 0
+        walk.append(("try", tuple(b), e))
+    return walk
+
+
+def test_random_seeks():
+    rng   = random.Random(8)
+    start = [1, 2, 3, 4, 5, 6, 0, 7, 8]
+    events = list(PureBacktrackSolver(start, 3, list(GOAL3)).events())
+    walk  = random_walk(GOAL3, 500, seed=9)   # spans many keyframes
+    for trace_start, evs in ((start, events), (GOAL3, walk)):
+        store = TraceStore(trace_start)
+        store.extend(evs)
+        assert len(store) == len(evs)
+        assert list(store) == evs
+        for _ in range(500):
+            i = rng.randrange(len(evs))
+            assert store[i] == evs[i]
+        assert store[-1] == evs[-1]
+        with pytest.raises(IndexError):
+            store[len(evs)]
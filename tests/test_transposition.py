@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from backtrack import PureBacktrackSolver
+from board import apply_move, move_table
+from conftest import GOAL3
+from transposition import ENTRY_BYTES, TranspositionTable
+
+
+def test_probe_records_and_hits():
+    tt = TranspositionTable(max_entries=4)
+    assert not tt.probe(1, 5)
+    assert tt.probe(1, 5)               # same depth: nothing new below
+    assert tt.probe(1, 7)               # deeper: even less left to spend
+    assert not tt.probe(1, 3)           # shallower: worth expanding again
+    assert tt.depths[1] == 3
+    assert tt.hits == 2
+    assert len(tt) == 1 and 1 in tt
+
+
+def test_lru_eviction():
+    tt = TranspositionTable(max_entries=3)
+    for state in (1, 2, 3):
+        tt.probe(state, 0)
+    tt.probe(1, 0)                      # a hit makes 1 most recent
+    tt.probe(4, 0)
+    assert 2 not in tt
+    assert list(tt.depths) == [3, 1, 4]
+    assert tt.evictions == 1
+    tt.probe(5, 0)
+    assert list(tt.depths) == [1, 4, 5]
+    assert len(tt) == 3 and tt.evictions == 2
+    tt.clear()
+    assert len(tt) == 0 and tt.hits == tt.evictions == 0
+
+
+def test_sizing():
+    assert TranspositionTable(max_mb=1).max_entries == 2**20 // ENTRY_BYTES
+    with pytest.raises(ValueError):
+        TranspositionTable(max_entries=0)
+
+
+def _around_the_limit(exact3, seed):
+    """One board at each distance from 10 to 17, around the depth limit."""
+    rng  = random.Random(seed)
+    nbrs = move_table(3)
+    want = {}
+    b, prev = GOAL3, None
+    while len(want) < 8:
+        e = b.index(0)
+        idx = rng.choice([i for i in nbrs[e] if i != prev])
+        b, prev = apply_move(b, idx, e), e
+        d = exact3.distance(b)
+        if 10 <= d <= 17:
+            want.setdefault(d, list(b))
+    return [want[d] for d in sorted(want)]
+
+
+@pytest.mark.parametrize("entries", [8, 1000, 10**6])
+def test_table_keeps_every_solution(entries, exact3):
+    limit = PureBacktrackSolver.DEPTH_LIMIT
+    for board in _around_the_limit(exact3, seed=15):
+        plain = PureBacktrackSolver(board, 3, GOAL3)
+        plain.solve()
+        table = TranspositionTable(max_entries=entries)
+        fast  = PureBacktrackSolver(board, 3, GOAL3, table=table)
+        fast.solve()
+        assert plain.found == (exact3.distance(board) <= limit)
+        assert fast.found == plain.found
+        if plain.found:
+            assert fast.trace[-1][:2] == ("done", GOAL3)
@@ -0,0 +1,57 @@
+"""
+Bounded transposition table for the depth-first solvers.
+
+A depth-limited DFS reaches the same board along many different paths
+and explores the subtree below it every time.  The table remembers the
+shallowest depth each packed state has been expanded at: reaching it
+again at that depth or deeper leaves no more moves to spend than last
+time, so the subtree can be skipped.
+
+Memory is capped.  Entries live in an OrderedDict in least-recently-used
+order; once the cap is reached every new entry evicts the oldest one.
+"""
+from collections import OrderedDict
+
+# rough cost of one OrderedDict entry holding a packed board and a depth
+ENTRY_BYTES = 128
+
+
+class TranspositionTable:
+    def __init__(self, max_entries=None, max_mb=None):
+        if max_entries is None:
+            max_entries = int((max_mb or 64) * 2**20) // ENTRY_BYTES
+        if max_entries < 1:
+            raise ValueError("transposition table needs room for one entry")
+        self.max_entries = max_entries
+        self.depths      = OrderedDict()
+        self.hits        = 0
+        self.evictions   = 0
+
+    def __len__(self):
+        return len(self.depths)
+
+    def __contains__(self, state):
+        return state in self.depths
+
+    def probe(self, state, depth):
+        """
+        True if state was already expanded at depth or shallower, so the
+        caller can prune it.  Otherwise records depth for state and
+        returns False.
+        """
+        depths = self.depths
+        best = depths.get(state)
+        if best is not None:
+            depths.move_to_end(state)
+            if best <= depth:
+                self.hits += 1
+                return True
+        elif len(depths) >= self.max_entries:
+            depths.popitem(last=False)
+            self.evictions += 1
+        depths[state] = depth
+        return False
+
+    def clear(self):
+        self.depths.clear()
+        self.hits = self.evictions = 0